@@ -0,0 +1,29 @@
+"""Add partial index on tracks missing a recording MBID
+
+Revision ID: 010_tracks_missing_mbid_index
+Revises: 009_commentary_track_id
+Create Date: 2026-03-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '010_tracks_missing_mbid_index'
+down_revision: Union[str, None] = '009_commentary_track_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tracks_id_missing_recording_mbid',
+        'tracks',
+        ['id'],
+        postgresql_where=sa.text('recording_mbid IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracks_id_missing_recording_mbid', table_name='tracks')
@@ -0,0 +1,33 @@
+"""Add (status, track_id) index on mb_candidates
+
+Revision ID: 011_mb_candidates_status_track
+Revises: 010_tracks_missing_mbid_index
+Create Date: 2026-03-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '011_mb_candidates_status_track'
+down_revision: Union[str, None] = '010_tracks_missing_mbid_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # mb_candidates is created by the app at startup, so it may not exist yet;
+    # if it doesn't, create_all builds the index from the model
+    if not sa.inspect(op.get_bind()).has_table('mb_candidates'):
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mb_candidates_status_track_id "
+            "ON mb_candidates (status, track_id) INCLUDE (score)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_mb_candidates_status_track_id")
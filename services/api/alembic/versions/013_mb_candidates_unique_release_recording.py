@@ -0,0 +1,44 @@
+"""Add unique (track_id, mb_release_id, mb_recording_id) index on mb_candidates
+
+Revision ID: 013_mb_candidates_unique
+Revises: 012_mb_candidates_track_status
+Create Date: 2026-03-03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '013_mb_candidates_unique'
+down_revision: Union[str, None] = '012_mb_candidates_track_status'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # mb_candidates is created by the app at startup, so it may not exist yet;
+    # if it doesn't, create_all builds the index from the model
+    if not sa.inspect(op.get_bind()).has_table('mb_candidates'):
+        return
+
+    # Drop duplicate candidates, keeping one per group: an approved row wins
+    # over a pending one, which wins over the rest; ties keep the oldest
+    op.execute(
+        "DELETE FROM mb_candidates WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT id, row_number() OVER ("
+        "PARTITION BY track_id, mb_release_id, coalesce(mb_recording_id, '') "
+        "ORDER BY CASE status::text WHEN 'approved' THEN 0 WHEN 'pending' THEN 1 ELSE 2 END, id"
+        ") AS rank FROM mb_candidates"
+        ") ranked WHERE rank > 1"
+        ")"
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_mb_candidates_track_release_recording "
+        "ON mb_candidates (track_id, mb_release_id, coalesce(mb_recording_id, ''))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ux_mb_candidates_track_release_recording")
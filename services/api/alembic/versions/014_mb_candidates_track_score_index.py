@@ -0,0 +1,33 @@
+"""Add (track_id, score DESC NULLS LAST) index on mb_candidates
+
+Revision ID: 014_mb_candidates_track_score
+Revises: 013_mb_candidates_unique
+Create Date: 2026-03-04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '014_mb_candidates_track_score'
+down_revision: Union[str, None] = '013_mb_candidates_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # mb_candidates is created by the app at startup, so it may not exist yet;
+    # if it doesn't, create_all builds the index from the model
+    if not sa.inspect(op.get_bind()).has_table('mb_candidates'):
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mb_candidates_track_id_score "
+            "ON mb_candidates (track_id, score DESC NULLS LAST)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_mb_candidates_track_id_score")
@@ -0,0 +1,29 @@
+"""Add indexed basename column to tracks
+
+Revision ID: 015_tracks_basename
+Revises: 014_mb_candidates_track_score
+Create Date: 2026-03-05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '015_tracks_basename'
+down_revision: Union[str, None] = '014_mb_candidates_track_score'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tracks', sa.Column('basename', sa.String(length=1000), nullable=True))
+    op.execute(
+        "UPDATE tracks SET basename = regexp_replace(file_path, '^.*/', '')"
+    )
+    op.create_index('ix_tracks_basename', 'tracks', ['basename'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracks_basename', table_name='tracks')
+    op.drop_column('tracks', 'basename')
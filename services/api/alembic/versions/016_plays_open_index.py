@@ -0,0 +1,29 @@
+"""Add partial index on plays that haven't ended
+
+Revision ID: 016_plays_open_index
+Revises: 015_tracks_basename
+Create Date: 2026-03-06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '016_plays_open_index'
+down_revision: Union[str, None] = '015_tracks_basename'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # plays grows with every track change; build without blocking writes
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_plays_open_started_at "
+            "ON plays (started_at DESC) WHERE ended_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_plays_open_started_at")
@@ -0,0 +1,44 @@
+"""Allow at most one open play per station
+
+Revision ID: 017_plays_open_per_station
+Revises: 016_plays_open_index
+Create Date: 2026-03-07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '017_plays_open_per_station'
+down_revision: Union[str, None] = '016_plays_open_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Close stale open plays left behind by earlier races: each one ends when
+    # the next open play on the same station started
+    op.execute("""
+        UPDATE plays
+        SET ended_at = stale.next_started_at
+        FROM (
+            SELECT id,
+                   lag(started_at) OVER (
+                       PARTITION BY lower(coalesce(station_identifier, 'main'))
+                       ORDER BY started_at DESC, id DESC
+                   ) AS next_started_at
+            FROM plays
+            WHERE ended_at IS NULL
+        ) AS stale
+        WHERE plays.id = stale.id AND stale.next_started_at IS NOT NULL
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_plays_open_per_station "
+            "ON plays (lower(coalesce(station_identifier, 'main'))) WHERE ended_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_plays_open_per_station")
@@ -0,0 +1,29 @@
+"""Record file size and mtime on tracks for incremental scans
+
+Revision ID: 018_tracks_file_stat
+Revises: 017_plays_open_per_station
+Create Date: 2026-03-08
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '018_tracks_file_stat'
+down_revision: Union[str, None] = '017_plays_open_per_station'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # file_size was never populated; widen it before scans start filling it
+    op.alter_column('tracks', 'file_size', type_=sa.BigInteger(), existing_type=sa.Integer(),
+                    existing_nullable=True)
+    op.add_column('tracks', sa.Column('file_mtime_ns', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tracks', 'file_mtime_ns')
+    op.alter_column('tracks', 'file_size', type_=sa.Integer(), existing_type=sa.BigInteger(),
+                    existing_nullable=True)
@@ -3,34 +3,84 @@ Artwork extraction and serving endpoint.
 Extracts album artwork directly from audio file ID3/metadata tags.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Integer, String, column, select, update, values
 import structlog
 from pathlib import Path
 import os
-from typing import Optional
+from typing import Literal, Optional
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import hashlib
 import io
+import tempfile
 
 from app.core.database import get_db
 from app.models import Track
-from mutagen import File as MutagenFile
-from mutagen.id3 import ID3, APIC
+from app.services.metadata_extractor import get_process_pool, shutdown_metadata_pool
+from mutagen import File as MutagenFile, MutagenError
+from mutagen.id3 import ID3, APIC, ID3NoHeaderError
 from mutagen.mp4 import MP4
 from mutagen.flac import FLAC
+from PIL import Image
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Max files parsed concurrently by batch extraction (bounds open file handles)
+BATCH_EXTRACT_CONCURRENCY = 8
+BATCH_COMMIT_SIZE = 100
+
+# Extracted artwork is cached here and served by the /static/artwork mount
+ARTWORK_DIR = Path("/shared/artwork")
+ARTWORK_URL_PREFIX = "/static/artwork"
+ARTWORK_CACHE_CONTROL = "public, max-age=86400"  # Cache for 24 hours
+
+FLAC_MAGIC = b"fLaC"
+FLAC_PICTURE_BLOCK = 6
+
+# Downscaled JPEG variants for list views, keyed by the ?size= value
+THUMBNAIL_SIZES = {"s": 128, "m": 512}
+THUMBNAIL_JPEG_QUALITY = 82
+
+MIME_TO_EXT = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/bmp": "bmp",
+    "image/webp": "webp"
+}
+
 
 @router.get("/track/{track_id}")
 async def get_track_artwork(
     track_id: int,
+    request: Request,
+    size: Literal["s", "m", "orig"] = Query("orig"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Extract and serve artwork directly from audio file ID3 tags"""
+    """Serve track artwork, extracting it from the audio file on first request.
+
+    Once extracted the artwork lives in the static artwork directory, so later
+    requests are redirected there and never touch the audio file again; the
+    redirect carries an ETag for the cached file so browsers can revalidate it.
+    ``size=s`` / ``size=m`` select the 128px / 512px JPEG thumbnails.
+    """
     try:
+        cached_path = _find_cached_artwork(track_id, size)
+        if cached_path:
+            etag = _artwork_etag(cached_path)
+            headers = {"Cache-Control": ARTWORK_CACHE_CONTROL, "ETag": etag}
+            if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+                return Response(status_code=304, headers=headers)
+            return RedirectResponse(
+                url=f"{ARTWORK_URL_PREFIX}/{cached_path.name}",
+                status_code=302,
+                headers=headers
+            )
+
         # Get track from database
         result = await db.execute(select(Track).where(Track.id == track_id))
         track = result.scalar_one_or_none()
@@ -40,19 +90,42 @@ async def get_track_artwork(
         
         if not track.file_path or not os.path.exists(track.file_path):
             raise HTTPException(status_code=404, detail="Audio file not found")
+
+        # Embedded artwork only changes when the audio file does
+        etag = _artwork_etag(track.file_path)
+        if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers={"ETag": etag})
         
         # Extract artwork from audio file
-        artwork_data, mime_type = await _extract_artwork_from_file(track.file_path)
+        artwork_data, mime_type = await asyncio.to_thread(_extract_artwork_from_file, track.file_path)
         
         if not artwork_data:
             raise HTTPException(status_code=404, detail="No artwork found in audio file")
+
+        # Cache the artwork so subsequent requests are served statically
+        try:
+            ARTWORK_DIR.mkdir(exist_ok=True)
+            track.artwork_url = await asyncio.to_thread(_write_cached_artwork, track_id, artwork_data, mime_type)
+            await db.commit()
+        except OSError as e:
+            logger.warning("Failed to cache track artwork", track_id=track_id, error=str(e))
+
+        if size != "orig":
+            thumbnail_path = _find_cached_artwork(track_id, size)
+            if thumbnail_path:
+                return RedirectResponse(
+                    url=f"{ARTWORK_URL_PREFIX}/{thumbnail_path.name}",
+                    status_code=302
+                )
+            # Thumbnail couldn't be generated; fall back to the full image
         
         # Serve the artwork
-        return StreamingResponse(
-            io.BytesIO(artwork_data),
+        return Response(
+            content=artwork_data,
             media_type=mime_type,
             headers={
-                "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+                "Cache-Control": ARTWORK_CACHE_CONTROL,
+                "ETag": etag,
                 "Content-Disposition": f'inline; filename="artwork_{track_id}.{_get_file_extension(mime_type)}"'
             }
         )
@@ -82,23 +155,12 @@ async def extract_and_cache_artwork(
             raise HTTPException(status_code=404, detail="Audio file not found")
         
         # Check if artwork exists in file
-        artwork_data, mime_type = await _extract_artwork_from_file(track.file_path)
+        artwork_data, mime_type = await asyncio.to_thread(_extract_artwork_from_file, track.file_path)
         
         if artwork_data:
-            # Save artwork to static files directory
-            artwork_dir = Path("/shared/artwork")
-            artwork_dir.mkdir(exist_ok=True)
-            
-            file_extension = _get_file_extension(mime_type)
-            artwork_filename = f"track_{track_id}.{file_extension}"
-            artwork_path = artwork_dir / artwork_filename
-            
-            # Write artwork data to file
-            with open(artwork_path, "wb") as f:
-                f.write(artwork_data)
-            
-            # Update the track's artwork_url to point to the cached file
-            new_artwork_url = f"/static/artwork/{artwork_filename}"
+            # Save artwork to static files directory and point the track at it
+            ARTWORK_DIR.mkdir(exist_ok=True)
+            new_artwork_url = await asyncio.to_thread(_write_cached_artwork, track_id, artwork_data, mime_type)
             
             await db.execute(
                 update(Track).where(Track.id == track_id).values(artwork_url=new_artwork_url)
@@ -143,43 +205,50 @@ async def batch_extract_artwork(
         
         extracted_count = 0
         failed_count = 0
+        pending_urls: list[tuple[int, str]] = []
         
-        for track in tracks:
-            if not track.file_path or not os.path.exists(track.file_path):
-                continue
-                
-            try:
-                # Check if this track has embedded artwork
-                artwork_data, mime_type = await _extract_artwork_from_file(track.file_path)
-                
-                if artwork_data:
-                    # Save artwork to static files directory
-                    artwork_dir = Path("/shared/artwork")
-                    artwork_dir.mkdir(exist_ok=True)
-                    
-                    file_extension = _get_file_extension(mime_type)
-                    artwork_filename = f"track_{track.id}.{file_extension}"
-                    artwork_path = artwork_dir / artwork_filename
-                    
-                    # Write artwork data to file
-                    with open(artwork_path, "wb") as f:
-                        f.write(artwork_data)
-                    
-                    # Update the track's artwork_url
-                    new_artwork_url = f"/static/artwork/{artwork_filename}"
-                    track.artwork_url = new_artwork_url
-                    extracted_count += 1
-                    
-                    if extracted_count % 10 == 0:
-                        await db.commit()
-                        logger.info("Batch progress", extracted=extracted_count, failed=failed_count)
-                        
-            except Exception as e:
-                failed_count += 1
-                logger.error("Failed to process track", track_id=track.id, error=str(e))
-                continue
+        ARTWORK_DIR.mkdir(exist_ok=True)
+
+        tracks_to_scan = [
+            track for track in tracks
+            if track.file_path and os.path.exists(track.file_path)
+        ]
+
+        # Extract and write artwork across CPU cores on the shared worker
+        # pool, a bounded chunk at a time; DB writes stay in this process
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        for start in range(0, len(tracks_to_scan), BATCH_EXTRACT_CONCURRENCY):
+            chunk = tracks_to_scan[start:start + BATCH_EXTRACT_CONCURRENCY]
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _extract_and_write_artwork, track.id, track.file_path)
+                    for track in chunk
+                ),
+                return_exceptions=True
+            )
+
+            for track, artwork_url in zip(chunk, results):
+                if isinstance(artwork_url, BrokenProcessPool):
+                    raise artwork_url
+                if isinstance(artwork_url, Exception):
+                    failed_count += 1
+                    logger.error("Failed to process track", track_id=track.id, error=str(artwork_url))
+                    continue
+
+                if not artwork_url:
+                    continue
+
+                pending_urls.append((track.id, artwork_url))
+                extracted_count += 1
+
+                if len(pending_urls) >= BATCH_COMMIT_SIZE:
+                    await _save_artwork_urls(db, pending_urls)
+                    pending_urls.clear()
+                    logger.info("Batch progress", extracted=extracted_count, failed=failed_count)
         
-        await db.commit()
+        if pending_urls:
+            await _save_artwork_urls(db, pending_urls)
         
         return {
             "status": "completed",
@@ -189,16 +258,38 @@ async def batch_extract_artwork(
             "message": f"Extracted artwork for {extracted_count} tracks"
         }
         
+    except BrokenProcessPool as e:
+        # A worker died (e.g. in a native image decoder); the next caller
+        # gets a fresh pool
+        shutdown_metadata_pool()
+        logger.error("Artwork worker pool broke during batch extraction", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Batch extraction failed: {str(e)}")
     except Exception as e:
         logger.error("Failed batch artwork extraction", error=str(e))
         raise HTTPException(status_code=500, detail=f"Batch extraction failed: {str(e)}")
 
 
-async def _extract_artwork_from_file(file_path: str) -> tuple[Optional[bytes], Optional[str]]:
-    """Extract artwork data and MIME type from audio file"""
+def _extract_artwork_from_file(file_path: str) -> tuple[Optional[bytes], Optional[str]]:
+    """Extract artwork data and MIME type from audio file.
+
+    Blocking (disk reads + tag parsing); call via asyncio.to_thread from handlers.
+    """
     try:
         path = Path(file_path)
         file_format = path.suffix.lower()
+
+        # Fast paths that read only the picture data instead of every tag frame
+        if file_format == '.flac':
+            artwork = _read_flac_picture(file_path)
+            if artwork is not None:
+                return artwork
+        elif file_format == '.mp3':
+            try:
+                return _extract_mp3_artwork(ID3(file_path, translate=False, load_v1=False))
+            except ID3NoHeaderError:
+                return None, None
+            except MutagenError as e:
+                logger.debug("ID3 fast path failed, falling back to full parse", file_path=file_path, error=str(e))
         
         # Load the audio file
         audio_file = MutagenFile(file_path)
@@ -207,7 +298,7 @@ async def _extract_artwork_from_file(file_path: str) -> tuple[Optional[bytes], O
         
         # Extract artwork based on file format
         if file_format == '.mp3':
-            return _extract_mp3_artwork(audio_file)
+            return _extract_mp3_artwork(audio_file.tags)
         elif file_format in ['.m4a', '.mp4']:
             return _extract_mp4_artwork(audio_file)
         elif file_format == '.flac':
@@ -221,18 +312,16 @@ async def _extract_artwork_from_file(file_path: str) -> tuple[Optional[bytes], O
         return None, None
 
 
-def _extract_mp3_artwork(audio_file) -> tuple[Optional[bytes], Optional[str]]:
+def _extract_mp3_artwork(tags) -> tuple[Optional[bytes], Optional[str]]:
     """Extract artwork from MP3 ID3 tags"""
     try:
-        if not audio_file.tags:
+        if not tags:
             return None, None
         
         # Look for APIC frames (Attached Picture)
-        for key in audio_file.tags:
-            if key.startswith('APIC'):
-                apic = audio_file.tags[key]
-                if apic.data:
-                    return apic.data, apic.mime
+        for apic in tags.getall('APIC'):
+            if apic.data:
+                return apic.data, apic.mime
         
         return None, None
         
@@ -258,10 +347,10 @@ def _extract_mp4_artwork(audio_file) -> tuple[Optional[bytes], Optional[str]]:
             else:
                 mime_type = "image/jpeg"  # Default fallback
         else:
-            # Try to detect from data
-            if cover_data[:3] == b'\xff\xd8\xff':
+            # Try to detect from data (startswith compares in place, no slice copies)
+            if cover_data.startswith(b'\xff\xd8\xff'):
                 mime_type = "image/jpeg"
-            elif cover_data[:8] == b'\x89PNG\r\n\x1a\n':
+            elif cover_data.startswith(b'\x89PNG\r\n\x1a\n'):
                 mime_type = "image/png"
             else:
                 mime_type = "image/jpeg"  # Default fallback
@@ -288,13 +377,155 @@ def _extract_flac_artwork(audio_file) -> tuple[Optional[bytes], Optional[str]]:
         return None, None
 
 
+def _read_flac_picture(file_path: str) -> Optional[tuple[Optional[bytes], Optional[str]]]:
+    """Read the first PICTURE block straight from a FLAC file's metadata blocks.
+
+    Every other metadata block is skipped with a seek, so only the picture
+    bytes are read. Returns None when the file doesn't start with the FLAC
+    marker (e.g. a prepended ID3 tag) so the caller can fall back to Mutagen.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(4) != FLAC_MAGIC:
+            return None
+
+        while True:
+            # METADATA_BLOCK_HEADER: 1 bit last-block flag, 7 bits type, 24 bits length
+            header = f.read(4)
+            if len(header) < 4:
+                return None, None
+
+            is_last = header[0] & 0x80
+            block_type = header[0] & 0x7F
+            block_length = int.from_bytes(header[1:4], "big")
+
+            if block_type == FLAC_PICTURE_BLOCK:
+                return _parse_flac_picture_block(f.read(block_length))
+            if is_last:
+                return None, None
+
+            f.seek(block_length, os.SEEK_CUR)
+
+
+def _parse_flac_picture_block(block: bytes) -> tuple[Optional[bytes], Optional[str]]:
+    """Parse a FLAC METADATA_BLOCK_PICTURE body into (data, mime type)"""
+    # picture type (4), then length-prefixed MIME type
+    offset = 4
+    mime_length = int.from_bytes(block[offset:offset + 4], "big")
+    offset += 4
+    mime_type = block[offset:offset + mime_length].decode("ascii", errors="replace")
+    offset += mime_length
+
+    # length-prefixed description, then width, height, depth, colors (4 each)
+    description_length = int.from_bytes(block[offset:offset + 4], "big")
+    offset += 4 + description_length + 16
+
+    data_length = int.from_bytes(block[offset:offset + 4], "big")
+    offset += 4
+    data = block[offset:offset + data_length]
+
+    if not data:
+        return None, None
+    return data, mime_type
+
+
 def _get_file_extension(mime_type: str) -> str:
     """Get file extension from MIME type"""
-    mime_to_ext = {
-        "image/jpeg": "jpg",
-        "image/png": "png",
-        "image/gif": "gif",
-        "image/bmp": "bmp",
-        "image/webp": "webp"
-    }
-    return mime_to_ext.get(mime_type, "jpg")
\ No newline at end of file
+    return MIME_TO_EXT.get(mime_type, "jpg")
+
+
+def _artwork_etag(file_path: str | Path) -> str:
+    """Build a strong ETag for a track's artwork from its source file's mtime and size"""
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(f"{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def _parse_if_none_match(header: Optional[str]) -> set[str]:
+    """Split an If-None-Match header into its entity tags"""
+    if not header:
+        return set()
+    return {tag.strip() for tag in header.split(",")}
+
+
+async def _save_artwork_urls(db: AsyncSession, rows: list[tuple[int, str]]) -> None:
+    """Point tracks at their cached artwork with a single UPDATE ... FROM (VALUES ...)"""
+    data = values(
+        column("id", Integer), column("artwork_url", String), name="data"
+    ).data(rows)
+    await db.execute(
+        update(Track)
+        .where(Track.id == data.c.id)
+        .values(artwork_url=data.c.artwork_url)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+def _find_cached_artwork(track_id: int, size: str = "orig") -> Optional[Path]:
+    """Return the cached artwork file for a track, if one has been extracted"""
+    if size in THUMBNAIL_SIZES:
+        thumbnail_path = ARTWORK_DIR / f"track_{track_id}_{THUMBNAIL_SIZES[size]}.jpg"
+        return thumbnail_path if thumbnail_path.is_file() else None
+
+    for file_extension in MIME_TO_EXT.values():
+        artwork_path = ARTWORK_DIR / f"track_{track_id}.{file_extension}"
+        if artwork_path.is_file():
+            return artwork_path
+    return None
+
+
+def _extract_and_write_artwork(track_id: int, file_path: str) -> Optional[str]:
+    """Extract a track's artwork and write it to the cache in one step.
+
+    Runs in the batch worker processes so multi-MB images are never pickled
+    back to the API process; each worker holds at most one image at a time.
+    Returns the artwork URL, or None when the file has no artwork.
+    """
+    artwork_data, mime_type = _extract_artwork_from_file(file_path)
+    if not artwork_data:
+        return None
+    return _write_cached_artwork(track_id, artwork_data, mime_type)
+
+
+def _write_cached_artwork(track_id: int, artwork_data: bytes, mime_type: Optional[str]) -> str:
+    """Write artwork and its thumbnails to the static artwork directory.
+
+    Returns the public URL of the full-size image. Blocking; call via
+    asyncio.to_thread from handlers. The caller creates ARTWORK_DIR once up
+    front, keeping the mkdir out of batch loops.
+    """
+    artwork_filename = f"track_{track_id}.{_get_file_extension(mime_type)}"
+    _write_artwork_file(artwork_filename, artwork_data)
+    _write_artwork_thumbnails(track_id, artwork_data)
+    return f"{ARTWORK_URL_PREFIX}/{artwork_filename}"
+
+
+def _write_artwork_thumbnails(track_id: int, artwork_data: bytes) -> None:
+    """Write the downscaled JPEG variants listed in THUMBNAIL_SIZES"""
+    try:
+        with Image.open(io.BytesIO(artwork_data)) as image:
+            image = image.convert("RGB")
+            for edge in sorted(THUMBNAIL_SIZES.values(), reverse=True):
+                # Shrink largest-first so each pass resamples fewer pixels
+                image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                image.save(buffer, "JPEG", quality=THUMBNAIL_JPEG_QUALITY, optimize=True, progressive=True)
+                _write_artwork_file(f"track_{track_id}_{edge}.jpg", buffer.getvalue())
+    except (OSError, Image.DecompressionBombError, SyntaxError, ValueError) as e:
+        # Art Pillow can't decode (or a failed thumbnail write) still leaves the full-size image served
+        logger.warning("Failed to generate artwork thumbnails", track_id=track_id, error=str(e))
+
+
+def _write_artwork_file(filename: str, data: bytes) -> None:
+    """Write to a temp file and rename it into place so concurrent readers
+    never see a partial image"""
+    fd, tmp_path = tempfile.mkstemp(dir=ARTWORK_DIR, prefix=f".{filename}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600; static serving needs the usual file mode
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, ARTWORK_DIR / filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,14 +1,25 @@
 """Authentication endpoints: login and initial admin setup."""
+import asyncio
 from datetime import datetime, timezone
+from functools import lru_cache
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+from typing import Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr, field_validator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, select
 import structlog
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
 from app.models.users import User
 
 router = APIRouter()
@@ -16,6 +27,23 @@ logger = structlog.get_logger()
 
 _BCRYPT_MAX_BYTES = 72
 
+# Password hashing is deliberately expensive, so cap login attempts per client
+# IP within a short sliding window
+LOGIN_ATTEMPTS_PER_WINDOW = 10
+LOGIN_ATTEMPT_WINDOW_SECONDS = 60
+_login_attempts: TTLCache = TTLCache(maxsize=10_000, ttl=LOGIN_ATTEMPT_WINDOW_SECONDS)
+
+# Verified against when the email is unknown so both failure paths cost the same
+_DUMMY_HASH = get_password_hash("x" * 32)
+
+# Once a user exists setup can never be needed again, so /me stops asking the DB
+_setup_complete = False
+
+
+async def _any_user_exists(db: AsyncSession) -> bool:
+    """SELECT EXISTS(...) so the check never hydrates a User row"""
+    return (await db.execute(select(exists().select_from(User)))).scalar_one()
+
 
 class LoginRequest(BaseModel):
     email: str
@@ -43,13 +71,63 @@ class SetupRequest(BaseModel):
         return v
 
 
+@lru_cache(maxsize=8)
+def _trusted_proxy_networks(spec: str) -> Tuple[IPv4Network | IPv6Network, ...]:
+    """Parse the TRUSTED_PROXIES setting (IPs or CIDRs, comma-separated)."""
+    return tuple(ip_network(entry.strip(), strict=False) for entry in spec.split(",") if entry.strip())
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxy_networks(settings.TRUSTED_PROXIES))
+
+
+def _client_ip(request: Request) -> str:
+    """Client IP for rate limiting.
+
+    X-Forwarded-For is client-controlled, so it is only read when the socket
+    peer is a trusted proxy, and then walked from the right: the first hop not
+    itself a trusted proxy is the address our proxies actually saw.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def _check_login_rate_limit(client_ip: str) -> None:
+    """Count a login attempt for the IP and raise 429 once over the limit."""
+    attempts = _login_attempts.get(client_ip, 0) + 1
+    _login_attempts[client_ip] = attempts
+    if attempts > LOGIN_ATTEMPTS_PER_WINDOW:
+        logger.warning("Login rate limit exceeded", client_ip=client_ip, attempts=attempts)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again shortly.",
+        )
+
+
 @router.post("/login", response_model=LoginResponse)
-async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+async def login(payload: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
     """Authenticate with email/password and return a JWT access token."""
+    client_ip = _client_ip(request)
+    _check_login_rate_limit(client_ip)
+
     result = await db.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.hashed_password):
+    # Always run a hash verification (CPU-bound, so off the event loop) so that
+    # unknown emails can't be distinguished by response time
+    hashed_password = user.hashed_password if user else _DUMMY_HASH
+    valid = await asyncio.to_thread(verify_password, payload.password, hashed_password)
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -57,6 +135,13 @@ async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Account disabled")
 
+    _login_attempts.pop(client_ip, None)
+
+    # Transparently upgrade legacy bcrypt hashes to argon2id
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await asyncio.to_thread(get_password_hash, payload.password)
+        logger.info("Upgraded password hash", user_id=user.id)
+
     # Update login tracking
     user.last_login_at = datetime.now(timezone.utc)
     user.login_count = (user.login_count or 0) + 1
@@ -76,8 +161,7 @@ async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
 @router.post("/setup", response_model=LoginResponse, status_code=201)
 async def setup_admin(payload: SetupRequest, db: AsyncSession = Depends(get_db)):
     """One-time admin account creation. Fails if any user already exists."""
-    existing = await db.execute(select(User).limit(1))
-    if existing.scalar_one_or_none():
+    if await _any_user_exists(db):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Setup already complete. Use /auth/login.",
@@ -85,7 +169,7 @@ async def setup_admin(payload: SetupRequest, db: AsyncSession = Depends(get_db))
 
     user = User(
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await asyncio.to_thread(get_password_hash, payload.password),
         full_name=payload.full_name,
         role="admin",
         is_active=True,
@@ -95,6 +179,9 @@ async def setup_admin(payload: SetupRequest, db: AsyncSession = Depends(get_db))
     await db.commit()
     await db.refresh(user)
 
+    global _setup_complete
+    _setup_complete = True
+
     token = create_access_token(user.id)
     logger.info("Admin account created", email=user.email)
     return LoginResponse(
@@ -108,6 +195,11 @@ async def setup_admin(payload: SetupRequest, db: AsyncSession = Depends(get_db))
 @router.get("/me")
 async def get_me(db: AsyncSession = Depends(get_db)):
     """Check if setup is needed (no users exist yet)."""
-    result = await db.execute(select(User).limit(1))
-    needs_setup = result.scalar_one_or_none() is None
+    global _setup_complete
+    if _setup_complete:
+        return {"needs_setup": False}
+
+    needs_setup = not await _any_user_exists(db)
+    if not needs_setup:
+        _setup_complete = True
     return {"needs_setup": needs_setup}
@@ -2,22 +2,25 @@
 import asyncio
 import difflib
 import re
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional
 
-import httpx
-import musicbrainzngs
+from cachetools import TTLCache
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update
+from sqlalchemy import Integer, literal_column, select, func, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, selectinload
 import structlog
 
 from app.core.database import get_db, get_db_session
 from app.core.deps import require_admin
+from app.core.http_client import get_http_client
 from app.models import Track
 from app.models.mb_candidate import MBCandidate, CandidateStatus
 from app.models.users import User
+from app.services.musicbrainz import mb_get
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -77,17 +80,107 @@ class LookupRequest(BaseModel):
     mb_url: str
 
 
-_MB_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
-_NON_GENRE_TAGS = {
+_MB_UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}', re.ASCII)
+# Lowercase; compare against tag.lower()
+_NON_GENRE_TAGS: frozenset[str] = frozenset({
     "animal on cover", "dog on cover", "cat on cover", "energetic", "playful",
     "melancholic", "uplifting", "eclectic", "melodic", "sarcastic", "satirical",
     "quirky", "urban", "aggressive", "dark", "romantic", "happy", "sad",
     "instrumental", "live", "compilation", "reissue", "remixed",
-}
+})
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+# Releases and their cover art rarely change, and MusicBrainz allows ~1 req/s,
+# so remember lookups for a day
+MB_CACHE_TTL_SECONDS = 24 * 60 * 60
+_mb_release_cache: TTLCache = TTLCache(maxsize=4096, ttl=MB_CACHE_TTL_SECONDS)
+_mb_release_inflight: dict[str, asyncio.Future] = {}
+_caa_front_cache: TTLCache = TTLCache(maxsize=4096, ttl=MB_CACHE_TTL_SECONDS)
+
+
+def _artist_credit_phrase(credits: Optional[list]) -> str:
+    return "".join(
+        (credit.get("name") or "") + (credit.get("joinphrase") or "")
+        for credit in credits or []
+    )
+
+
+def _release_from_ws2_json(data: dict) -> dict:
+    """Reshape a /ws/2 JSON release into the musicbrainzngs layout the
+    callers read ("release", "medium-list", "artist-credit-phrase", ...)"""
+    return {"release": {
+        "id": data.get("id"),
+        "title": data.get("title"),
+        "country": data.get("country"),
+        "date": data.get("date") or "",
+        "artist-credit-phrase": _artist_credit_phrase(data.get("artist-credit")),
+        "label-info-list": data.get("label-info") or [],
+        "medium-list": [
+            {"track-list": [
+                {"recording": {
+                    "id": (tr.get("recording") or {}).get("id"),
+                    "title": (tr.get("recording") or {}).get("title") or tr.get("title") or "",
+                    "artist-credit-phrase": _artist_credit_phrase(
+                        (tr.get("recording") or {}).get("artist-credit") or tr.get("artist-credit")
+                    ),
+                }}
+                for tr in medium.get("tracks") or []
+            ]}
+            for medium in data.get("media") or []
+        ],
+    }}
+
+
+async def _fetch_mb_release(release_mbid: str) -> dict:
+    """Fetch a release from the MusicBrainz JSON API on the shared client"""
+    data = await mb_get(
+        f"release/{release_mbid}", {"inc": "artist-credits labels recordings"}
+    )
+    return _release_from_ws2_json(data)
+
+
+async def _get_mb_release(release_mbid: str) -> dict:
+    """Fetch a MusicBrainz release, cached and with concurrent lookups of the
+    same MBID sharing one request. Callers must not mutate the result."""
+    cached = _mb_release_cache.get(release_mbid)
+    if cached is not None:
+        return cached
+
+    inflight = _mb_release_inflight.get(release_mbid)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_fetch_mb_release(release_mbid))
+        _mb_release_inflight[release_mbid] = inflight
+        inflight.add_done_callback(lambda _: _mb_release_inflight.pop(release_mbid, None))
+
+    result = await asyncio.shield(inflight)
+    _mb_release_cache[release_mbid] = result
+    return result
+
+
+async def _get_caa_front_url(release_mbid: str) -> Optional[str]:
+    """Resolve the Cover Art Archive front image URL for a release, if any"""
+    if release_mbid in _caa_front_cache:
+        return _caa_front_cache[release_mbid]
+
+    try:
+        resp = await get_http_client().get(
+            f"https://coverartarchive.org/release/{release_mbid}/front-500",
+            follow_redirects=True,
+            timeout=5.0,
+        )
+    except Exception:
+        # Transient failures aren't cached
+        return None
+
+    artwork_url = None
+    if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
+        artwork_url = str(resp.url)
+    _caa_front_cache[release_mbid] = artwork_url
+    return artwork_url
+
+
 def _normalize_title(t: str) -> str:
     t = t.lower().strip()
     t = re.sub(r'[^\w\s]', ' ', t)
@@ -99,15 +192,8 @@ async def _propagate_release(release_mbid: str, library_artist: str, library_alb
     After approving a candidate, look up all recordings in the same MB release
     and create high-confidence candidates for other library tracks from that album.
     """
-    loop = asyncio.get_event_loop()
-
     try:
-        def _fetch():
-            musicbrainzngs.set_useragent("Raido", "1.0", "raido@local")
-            return musicbrainzngs.get_release_by_id(
-                release_mbid, includes=["artists", "recordings", "labels"]
-            )
-        result = await loop.run_in_executor(None, _fetch)
+        result = await _get_mb_release(release_mbid)
     except Exception as e:
         logger.warning("Album propagation: MB fetch failed", release_mbid=release_mbid, error=str(e))
         return
@@ -149,17 +235,7 @@ async def _propagate_release(release_mbid: str, library_artist: str, library_alb
         return
 
     # Artwork
-    artwork_url = None
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                f"https://coverartarchive.org/release/{release_mbid}/front-500",
-                follow_redirects=True,
-            )
-            if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                artwork_url = str(resp.url)
-    except Exception:
-        pass
+    artwork_url = await _get_caa_front_url(release_mbid)
 
     async with get_db_session() as db:
         # Find unenriched library tracks from the same artist+album
@@ -223,26 +299,32 @@ async def _propagate_release(release_mbid: str, library_artist: str, library_alb
                     album=library_album, inserted=inserted)
 
 
-async def _apply_candidate_to_track(track: Track, candidate: MBCandidate) -> None:
-    """Write candidate proposed values onto the track model (does not commit)."""
-    if candidate.proposed_title:
-        track.title = candidate.proposed_title
-    if candidate.proposed_artist:
-        track.artist = candidate.proposed_artist
-    if candidate.proposed_album:
-        track.album = candidate.proposed_album
-    if candidate.proposed_year:
-        track.year = candidate.proposed_year
-    if candidate.proposed_genre:
-        track.genre = candidate.proposed_genre
-    if candidate.mb_recording_id:
-        track.recording_mbid = candidate.mb_recording_id
-    if candidate.mb_release_id:
-        track.release_mbid = candidate.mb_release_id
-    if candidate.proposed_isrc:
-        track.isrc = candidate.proposed_isrc
-    if candidate.proposed_artwork_url:
-        track.artwork_url = candidate.proposed_artwork_url
+# (candidate attribute, track attribute) pairs copied on approval
+_CANDIDATE_TO_TRACK_FIELDS = (
+    ("proposed_title", "title"),
+    ("proposed_artist", "artist"),
+    ("proposed_album", "album"),
+    ("proposed_year", "year"),
+    ("proposed_genre", "genre"),
+    ("mb_recording_id", "recording_mbid"),
+    ("mb_release_id", "release_mbid"),
+    ("proposed_isrc", "isrc"),
+    ("proposed_artwork_url", "artwork_url"),
+)
+
+
+def _candidate_track_values(candidate_row) -> dict:
+    """SET clause copying a candidate's proposed values onto its track.
+
+    Empty values (NULL, '' or 0) keep the track's current value, matching
+    the "only overwrite with something" rule of the review UI.
+    """
+    values = {}
+    for candidate_attr, track_attr in _CANDIDATE_TO_TRACK_FIELDS:
+        proposed = candidate_row.c[candidate_attr]
+        empty = 0 if isinstance(proposed.type, Integer) else ""
+        values[track_attr] = func.coalesce(func.nullif(proposed, empty), getattr(Track, track_attr))
+    return values
 
 
 # ── Routes ────────────────────────────────────────────────────────────────────
@@ -253,39 +335,40 @@ async def get_enrichment_stats(
     _: User = Depends(require_admin),
 ):
     """Overall enrichment progress stats."""
-    total = (await db.execute(select(func.count(Track.id)))).scalar_one()
-    with_mbid = (await db.execute(
-        select(func.count(Track.id)).where(Track.recording_mbid.isnot(None))
-    )).scalar_one()
-
-    # Tracks that have at least one candidate in each status
-    def _count_tracks_with_status(status: CandidateStatus):
-        return (
-            select(func.count(func.distinct(MBCandidate.track_id)))
-            .where(MBCandidate.status == status)
-        )
-
-    pending_tracks = (await db.execute(_count_tracks_with_status(CandidateStatus.pending))).scalar_one()
-    approved_tracks = (await db.execute(_count_tracks_with_status(CandidateStatus.approved))).scalar_one()
-    rejected_tracks = (await db.execute(_count_tracks_with_status(CandidateStatus.rejected))).scalar_one()
-    skipped_tracks = (await db.execute(_count_tracks_with_status(CandidateStatus.skipped))).scalar_one()
-
-    # Tracks with no candidates at all and no mbid
-    queued_track_ids_q = select(MBCandidate.track_id).distinct()
-    unqueued = (await db.execute(
-        select(func.count(Track.id))
-        .where(Track.recording_mbid.is_(None))
-        .where(Track.id.notin_(queued_track_ids_q))
-    )).scalar_one()
+    track_counts = select(
+        func.count(Track.id).label("total"),
+        func.count(Track.id).filter(Track.recording_mbid.isnot(None)).label("with_mbid"),
+        # Tracks with no candidates at all and no mbid. NOT EXISTS plans as the
+        # same anti-join as LEFT JOIN ... IS NULL, but without a join fanning
+        # out the other counts in this select
+        func.count(Track.id).filter(
+            Track.recording_mbid.is_(None),
+            ~select(MBCandidate.id).where(MBCandidate.track_id == Track.id).exists(),
+        ).label("unqueued"),
+    ).subquery("track_counts")
+
+    # Tracks that have at least one candidate in each status, in a single scan
+    status_counts = select(*(
+        func.count(func.distinct(MBCandidate.track_id))
+        .filter(MBCandidate.status == candidate_status)
+        .label(candidate_status.value)
+        for candidate_status in CandidateStatus
+    )).subquery("status_counts")
+
+    # Both single-row aggregates come back in one round-trip
+    counts = (await db.execute(
+        select(track_counts, status_counts)
+        .select_from(track_counts.join(status_counts, true()))
+    )).one()
 
     return EnrichmentStats(
-        total_tracks=total,
-        tracks_with_mbid=with_mbid,
-        tracks_pending=pending_tracks,
-        tracks_approved=approved_tracks,
-        tracks_rejected=rejected_tracks,
-        tracks_skipped=skipped_tracks,
-        tracks_unqueued=unqueued,
+        total_tracks=counts.total,
+        tracks_with_mbid=counts.with_mbid,
+        tracks_pending=counts.pending,
+        tracks_approved=counts.approved,
+        tracks_rejected=counts.rejected,
+        tracks_skipped=counts.skipped,
+        tracks_unqueued=counts.unqueued,
     )
 
 
@@ -294,57 +377,34 @@ async def get_enrichment_queue(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
     status: Optional[CandidateStatus] = Query(CandidateStatus.pending),
+    after_id: Optional[int] = Query(None, description="Return tracks after this one (keyset pagination; overrides page)"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_admin),
 ):
     """Paginated list of tracks that have candidates in the given status."""
-    # Get track IDs that have candidates with the requested status
-    subq = (
-        select(MBCandidate.track_id)
-        .where(MBCandidate.status == status)
-        .distinct()
-        .offset((page - 1) * per_page)
+    # Tracks that have candidates with the requested status; their candidates
+    # are loaded by a single batched IN query
+    query = (
+        select(Track)
+        .where(Track.id.in_(select(MBCandidate.track_id).where(MBCandidate.status == status)))
+        .options(selectinload(Track.candidates))
+        .order_by(Track.artist, Track.title, Track.id)
         .limit(per_page)
     )
-    track_ids_result = await db.execute(subq)
-    track_ids = [r[0] for r in track_ids_result.all()]
-
-    if not track_ids:
-        return []
+    if after_id is not None:
+        # Seek past the cursor track's sort key instead of skipping rows with
+        # OFFSET; also stable while reviewed tracks drop out of the queue
+        cursor = aliased(Track)
+        query = query.where(
+            cursor.id == after_id,
+            tuple_(Track.artist, Track.title, Track.id) > tuple_(cursor.artist, cursor.title, cursor.id),
+        )
+    else:
+        query = query.offset((page - 1) * per_page)
 
-    # Fetch tracks
-    tracks_result = await db.execute(
-        select(Track).where(Track.id.in_(track_ids)).order_by(Track.artist, Track.title)
-    )
-    tracks = tracks_result.scalars().all()
+    tracks = (await db.execute(query)).scalars().all()
 
-    # Fetch all candidates for these tracks
-    cands_result = await db.execute(
-        select(MBCandidate)
-        .where(MBCandidate.track_id.in_(track_ids))
-        .order_by(MBCandidate.score.desc().nullslast())
-    )
-    cands = cands_result.scalars().all()
-
-    cands_by_track: dict[int, list] = {}
-    for c in cands:
-        cands_by_track.setdefault(c.track_id, []).append(c)
-
-    return [
-        TrackWithCandidates(
-            id=t.id,
-            title=t.title,
-            artist=t.artist,
-            album=t.album,
-            year=t.year,
-            genre=t.genre,
-            artwork_url=t.artwork_url,
-            recording_mbid=t.recording_mbid,
-            file_path=t.file_path,
-            candidates=cands_by_track.get(t.id, []),
-        )
-        for t in tracks
-    ]
+    return [TrackWithCandidates.model_validate(t) for t in tracks]
 
 
 @router.get("/track/{track_id}", response_model=TrackWithCandidates)
@@ -354,29 +414,15 @@ async def get_track_candidates(
     _: User = Depends(require_admin),
 ):
     """Get a single track and all its MB candidates."""
-    track = (await db.execute(select(Track).where(Track.id == track_id))).scalar_one_or_none()
+    track = (await db.execute(
+        select(Track)
+        .where(Track.id == track_id)
+        .options(selectinload(Track.candidates))
+    )).scalar_one_or_none()
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
 
-    cands_result = await db.execute(
-        select(MBCandidate)
-        .where(MBCandidate.track_id == track_id)
-        .order_by(MBCandidate.score.desc().nullslast())
-    )
-    cands = cands_result.scalars().all()
-
-    return TrackWithCandidates(
-        id=track.id,
-        title=track.title,
-        artist=track.artist,
-        album=track.album,
-        year=track.year,
-        genre=track.genre,
-        artwork_url=track.artwork_url,
-        recording_mbid=track.recording_mbid,
-        file_path=track.file_path,
-        candidates=cands,
-    )
+    return TrackWithCandidates.model_validate(track)
 
 
 @router.post("/candidate/{candidate_id}/approve")
@@ -390,46 +436,50 @@ async def approve_candidate(
     Approve a candidate: apply its proposed values to the track,
     and reject all other pending candidates for that track.
     """
-    candidate = (await db.execute(
-        select(MBCandidate).where(MBCandidate.id == candidate_id)
-    )).scalar_one_or_none()
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-
-    track = (await db.execute(select(Track).where(Track.id == candidate.track_id))).scalar_one_or_none()
-    if not track:
-        raise HTTPException(status_code=404, detail="Track not found")
-
-    # Apply metadata to track
-    await _apply_candidate_to_track(track, candidate)
-
-    # Mark this candidate approved
-    candidate.status = CandidateStatus.approved
-    candidate.reviewed_at = datetime.now(timezone.utc)
-    candidate.reviewed_by = user.id
-
-    # Reject all other pending candidates for this track
-    await db.execute(
+    # Approve the candidate, reject its pending siblings and copy its values
+    # onto the track in a single statement of data-modifying CTEs
+    approved = (
+        update(MBCandidate)
+        .where(MBCandidate.id == candidate_id)
+        .values(status=CandidateStatus.approved, reviewed_at=func.now(), reviewed_by=user.id)
+        .returning(
+            MBCandidate.track_id,
+            *(getattr(MBCandidate, candidate_attr) for candidate_attr, _ in _CANDIDATE_TO_TRACK_FIELDS),
+        )
+        .cte("approved")
+    )
+    rejected = (
         update(MBCandidate)
-        .where(MBCandidate.track_id == candidate.track_id)
+        .where(MBCandidate.track_id == select(approved.c.track_id).scalar_subquery())
         .where(MBCandidate.id != candidate_id)
         .where(MBCandidate.status == CandidateStatus.pending)
-        .values(status=CandidateStatus.rejected, reviewed_at=datetime.now(timezone.utc))
+        .values(status=CandidateStatus.rejected, reviewed_at=func.now())
+        .cte("rejected")
     )
+    row = (await db.execute(
+        update(Track)
+        .where(Track.id == approved.c.track_id)
+        .values(**_candidate_track_values(approved))
+        .returning(Track.id, Track.artist, Track.album, approved.c.mb_release_id, approved.c.proposed_artist)
+        .add_cte(rejected)
+        .execution_options(synchronize_session=False)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Candidate not found")
 
     await db.commit()
-    logger.info("Candidate approved", candidate_id=candidate_id, track_id=track.id)
+    logger.info("Candidate approved", candidate_id=candidate_id, track_id=row.id)
 
     # Propagate to other tracks from the same album in the background
-    if candidate.mb_release_id and track.album:
+    if row.mb_release_id and row.album:
         background_tasks.add_task(
             _propagate_release,
-            candidate.mb_release_id,
-            candidate.proposed_artist or track.artist,
-            track.album,
+            row.mb_release_id,
+            row.proposed_artist or row.artist,
+            row.album,
         )
 
-    return {"status": "approved", "track_id": track.id}
+    return {"status": "approved", "track_id": row.id}
 
 
 @router.post("/candidate/{candidate_id}/reject")
@@ -446,7 +496,7 @@ async def reject_candidate(
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     candidate.status = CandidateStatus.rejected
-    candidate.reviewed_at = datetime.now(timezone.utc)
+    candidate.reviewed_at = func.now()
     candidate.reviewed_by = user.id
     await db.commit()
     return {"status": "rejected"}
@@ -466,12 +516,11 @@ async def skip_track(
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
 
-    now = datetime.now(timezone.utc)
     result = await db.execute(
         update(MBCandidate)
         .where(MBCandidate.track_id == track_id)
         .where(MBCandidate.status == CandidateStatus.pending)
-        .values(status=CandidateStatus.skipped, reviewed_at=now)
+        .values(status=CandidateStatus.skipped, reviewed_at=func.now())
     )
 
     # If no candidates exist yet, insert a skipped sentinel so the enricher won't re-queue it
@@ -479,7 +528,7 @@ async def skip_track(
         db.add(MBCandidate(
             track_id=track_id,
             status=CandidateStatus.skipped,
-            reviewed_at=now,
+            reviewed_at=func.now(),
             reviewed_by=user.id,
         ))
 
@@ -499,7 +548,7 @@ async def lookup_mb_release(
     Look up a MusicBrainz release by URL or UUID, match the track title to a
     recording within it, and add as a top-scored pending candidate.
     """
-    m = _MB_UUID_RE.search(payload.mb_url.strip())
+    m = _MB_UUID_RE.search(payload.mb_url)
     if not m:
         raise HTTPException(status_code=422, detail="No valid MusicBrainz UUID found in input")
     release_mbid = m.group(0).lower()
@@ -508,16 +557,13 @@ async def lookup_mb_release(
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
 
-    # Fetch release from MusicBrainz
-    loop = asyncio.get_event_loop()
+    # Fetch release from MusicBrainz; the cover art only depends on the MBID,
+    # so look it up concurrently (it never raises)
     try:
-        def _fetch():
-            musicbrainzngs.set_useragent("Raido", "1.0", "raido@local")
-            return musicbrainzngs.get_release_by_id(
-                release_mbid,
-                includes=["artists", "recordings", "labels"],
-            )
-        result = await loop.run_in_executor(None, _fetch)
+        result, artwork_url = await asyncio.gather(
+            _get_mb_release(release_mbid),
+            _get_caa_front_url(release_mbid),
+        )
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"MusicBrainz lookup failed: {e}")
 
@@ -545,62 +591,52 @@ async def lookup_mb_release(
     recording_mbid = None
     rec_title = track.title
     rec_artist = rel_artist
-    track_title_lower = track.title.lower().strip()
 
+    # Index recordings by title once; the first occurrence wins, as before
+    recordings_by_title = {}
     for medium in rel.get("medium-list") or []:
         for tr in medium.get("track-list") or []:
             rec = tr.get("recording") or {}
-            if rec.get("title", "").lower().strip() == track_title_lower:
-                recording_mbid = rec.get("id")
-                rec_title = rec.get("title") or track.title
-                rec_artist = (rec.get("artist-credit-phrase") or "").strip() or rel_artist
-                break
-        if recording_mbid:
-            break
-
-    # If already have a candidate with this release+recording combo, re-pend it
-    existing_q = select(MBCandidate).where(MBCandidate.track_id == track_id).where(MBCandidate.mb_release_id == release_mbid)
-    if recording_mbid:
-        existing_q = existing_q.where(MBCandidate.mb_recording_id == recording_mbid)
-    existing = (await db.execute(existing_q)).scalar_one_or_none()
-    if existing:
-        if existing.status != CandidateStatus.pending:
-            existing.status = CandidateStatus.pending
-            existing.score = 100.0
-            await db.commit()
-            await db.refresh(existing)
-        return existing
-
-    # Artwork from Cover Art Archive
-    artwork_url = None
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                f"https://coverartarchive.org/release/{release_mbid}/front-500",
-                follow_redirects=True,
-            )
-            if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                artwork_url = str(resp.url)
-    except Exception:
-        pass
-
-    candidate = MBCandidate(
-        track_id=track_id,
-        status=CandidateStatus.pending,
-        score=100.0,
-        mb_recording_id=recording_mbid,
-        mb_release_id=release_mbid,
-        proposed_title=rec_title,
-        proposed_artist=rec_artist,
-        proposed_album=album,
-        proposed_year=year,
-        proposed_country=country,
-        proposed_label=label,
-        proposed_artwork_url=artwork_url,
-        reviewed_by=user.id,
+            recordings_by_title.setdefault(rec.get("title", "").lower().strip(), rec)
+
+    rec = recordings_by_title.get(track.title.lower().strip())
+    if rec:
+        recording_mbid = rec.get("id")
+        rec_title = rec.get("title") or track.title
+        rec_artist = (rec.get("artist-credit-phrase") or "").strip() or rel_artist
+
+    # Insert, or re-pend an existing candidate for this release+recording combo
+    stmt = (
+        pg_insert(MBCandidate)
+        .values(
+            track_id=track_id,
+            status=CandidateStatus.pending,
+            score=100.0,
+            mb_recording_id=recording_mbid,
+            mb_release_id=release_mbid,
+            proposed_title=rec_title,
+            proposed_artist=rec_artist,
+            proposed_album=album,
+            proposed_year=year,
+            proposed_country=country,
+            proposed_label=label,
+            proposed_artwork_url=artwork_url,
+            reviewed_by=user.id,
+        )
+        .on_conflict_do_update(
+            index_elements=[
+                MBCandidate.track_id,
+                MBCandidate.mb_release_id,
+                # Inline literal so Postgres can match the index expression
+                func.coalesce(MBCandidate.mb_recording_id, literal_column("''")),
+            ],
+            set_={"status": CandidateStatus.pending, "score": 100.0, "updated_at": func.now()},
+        )
+        .returning(MBCandidate)
     )
-    db.add(candidate)
+    candidate = (await db.execute(
+        stmt, execution_options={"populate_existing": True}
+    )).scalar_one()
     await db.commit()
-    await db.refresh(candidate)
     logger.info("Manual MB release lookup candidate added", track_id=track_id, release_mbid=release_mbid, recording_mbid=recording_mbid)
     return candidate
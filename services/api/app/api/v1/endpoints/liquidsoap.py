@@ -1,16 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import time
+import unicodedata
+
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import BigInteger, DateTime, cast, func, literal, literal_column, or_, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import structlog
-import httpx
 from datetime import datetime, timezone
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_session
+from app.core.http_client import get_http_client
+from app.core.redis_client import get_redis
 from app.models import Track, Play, Station
+from app.models.stations import station_tracks
 from app.core.websocket_manager import WebSocketManager
+from app.services.liquidsoap_telnet import get_telnet_pool
 from app.services.metadata_extractor import MetadataExtractor
+from app.services.musicbrainz import mb_get, mb_search_query
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -18,6 +33,40 @@ logger = structlog.get_logger()
 # This would be injected in main.py
 websocket_manager: Optional[WebSocketManager] = None
 
+# Artwork lookups hit iTunes/MusicBrainz; remember hits for a day and misses
+# for an hour so repeat plays of a track don't go back to the network
+ARTWORK_CACHE_TTL_SECONDS = 24 * 60 * 60
+ARTWORK_MISS_CACHE_TTL_SECONDS = 60 * 60
+_artwork_cache: TTLCache = TTLCache(maxsize=4096, ttl=ARTWORK_CACHE_TTL_SECONDS)
+_artwork_miss_cache: TTLCache = TTLCache(maxsize=4096, ttl=ARTWORK_MISS_CACHE_TTL_SECONDS)
+_artwork_inflight: Dict[tuple, asyncio.Future] = {}
+# Artwork URLs are tiny and stable, so the shared Redis tier keeps hits longer
+ARTWORK_REDIS_TTL_SECONDS = 30 * 24 * 60 * 60
+ARTWORK_HTTP_TIMEOUT = 5.0
+# Overall wait for the concurrent Cover Art Archive probes of one search
+CAA_PROBE_BUDGET_SECONDS = 3.0
+# Cap concurrent requests per artwork upstream so bursts of track changes
+# don't trip iTunes' rate limit; waits longer than the threshold are logged
+_itunes_slots = asyncio.Semaphore(4)
+_caa_slots = asyncio.Semaphore(6)
+UPSTREAM_SLOT_WAIT_LOG_SECONDS = 0.1
+
+# Station identifier -> id. Stations are only ever added, and there are a
+# handful of them, so resolve each once per process
+_station_ids: Dict[str, int] = {}
+
+# Characters replaced when building a synthetic liquidsoap:// path
+_SAFE_PATH_TABLE = str.maketrans({" ": "_", "/": "_"})
+_YEAR_RE = re.compile(r"\s*(\d{4})\s*", re.ASCII)
+
+
+def _parse_year(value: Any) -> Optional[int]:
+    """Four-digit year from a tag value, or None"""
+    if value is None:
+        return None
+    match = _YEAR_RE.fullmatch(str(value))
+    return int(match.group(1)) if match else None
+
 class TrackChangeRequest(BaseModel):
     title: Optional[str] = None
     artist: Optional[str] = None
@@ -29,37 +78,130 @@ class TrackChangeRequest(BaseModel):
     station: Optional[str] = "main"  # Station identifier (main, christmas, etc.)
     metadata: Dict[str, Any] = {}
 
+    class Config:
+        # Liquidsoap passes tag values through untrimmed; strip them once here
+        # rather than in every lookup and comparison
+        str_strip_whitespace = True
+        extra = "ignore"
+
+def _find_track_stmt(request: TrackChangeRequest):
+    """Build one statement resolving the reported track, or None if unidentifiable.
+
+    Candidates are ranked basename match, bare filename suffix match, then
+    title/artist, and fetched in a single round-trip. The suffix scan only
+    runs when the indexed basename lookup found nothing, and never for our
+    own synthetic liquidsoap:// paths, which are only ever stored whole.
+    """
+    branches = []
+    if request.filename:
+        by_file = (
+            select(Track.id, literal_column("0").label("rank"))
+            .where(
+                Track.basename == os.path.basename(request.filename),
+                Track.file_path.endswith(request.filename),
+            )
+            .limit(1)
+            .cte("by_file")
+        )
+        branches.append(select(by_file.c.id, by_file.c.rank))
+        # Partial names that don't line up with a stored basename
+        if not request.filename.startswith("liquidsoap://"):
+            by_suffix = (
+                select(Track.id, literal_column("1").label("rank"))
+                .where(
+                    Track.file_path.endswith(request.filename),
+                    ~select(by_file.c.id).exists(),
+                )
+                .limit(1)
+                .cte("by_suffix")
+            )
+            branches.append(select(by_suffix.c.id, by_suffix.c.rank))
+    if request.title and request.artist:
+        by_title = (
+            select(Track.id, literal_column("2").label("rank"))
+            .where(Track.title == request.title, Track.artist == request.artist)
+            .limit(1)
+            .cte("by_title")
+        )
+        branches.append(select(by_title.c.id, by_title.c.rank))
+    if not branches:
+        return None
+
+    candidates = union_all(*branches).subquery("candidates")
+    return (
+        select(Track)
+        .join(candidates, candidates.c.id == Track.id)
+        .order_by(candidates.c.rank)
+        .limit(1)
+    )
+
+# Overlapping callbacks for one station race for its single open-play slot
+PLAY_INSERT_ATTEMPTS = 3
+
+
+async def _start_play(db: AsyncSession, station_identifier: str, values: Dict[str, Any]) -> Play:
+    """End the station's open play and insert a new one.
+
+    uq_plays_open_per_station allows one open play per station, so there is
+    no "latest open play" lookup; the key expression matches the index's
+    ('main' inlined, not bound). When an overlapping callback (skip, inject)
+    commits its own play first, our insert does nothing; close that play too
+    and try again rather than failing the whole callback.
+    """
+    station_key = func.lower(func.coalesce(Play.station_identifier, literal_column("'main'")))
+    insert_play = (
+        pg_insert(Play)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[station_key], index_where=Play.ended_at.is_(None))
+        .returning(Play)
+    )
+    for _ in range(PLAY_INSERT_ATTEMPTS):
+        ended_at_param = literal(datetime.now(timezone.utc), DateTime(timezone=True))
+        await db.execute(
+            update(Play)
+            .where(Play.ended_at.is_(None))
+            .where(station_key == station_identifier)
+            .values(
+                ended_at=ended_at_param,
+                elapsed_ms=cast(
+                    func.extract("epoch", ended_at_param - Play.started_at) * 1000,
+                    BigInteger,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        new_play = (await db.execute(
+            insert_play, execution_options={"populate_existing": True}
+        )).scalar_one_or_none()
+        if new_play is not None:
+            return new_play
+        logger.info("Open play taken by an overlapping callback; retrying", station=station_identifier)
+    raise RuntimeError(f"Could not start a play for station {station_identifier!r}")
+
 @router.post("/track_change")
 async def track_change_notification(
     request: TrackChangeRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Handle track change notifications from Liquidsoap"""
     try:
         logger.info("Received track change notification",
                    station=request.station,
-                   track_data=request.dict())
+                   title=request.title,
+                   artist=request.artist,
+                   filename=request.filename)
+        # The full payload (incl. metadata) is only worth copying when it's logged
+        # Ask stdlib logging (which structlog filters through): the structlog
+        # proxy only has isEnabledFor once configure_logging() has run
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logger.debug("Track change payload", track_data=request.model_dump(exclude_none=True))
         
         # Find or create track record
         track = None
-        if request.filename:
-            # Try to find existing track by filename
-            result = await db.execute(
-                select(Track).where(Track.file_path.endswith(request.filename))
-            )
-            tracks = result.scalars().all()
-            track = tracks[0] if tracks else None
-        
-        if not track and (request.title and request.artist):
-            # Try to find by title/artist
-            result = await db.execute(
-                select(Track).where(
-                    Track.title == request.title,
-                    Track.artist == request.artist
-                )
-            )
-            tracks = result.scalars().all()
-            track = tracks[0] if tracks else None
+        find_stmt = _find_track_stmt(request)
+        if find_stmt is not None:
+            track = (await db.execute(find_stmt)).scalars().first()
         
         # Create track if not found
         if not track:
@@ -67,8 +209,8 @@ async def track_change_notification(
             file_path = request.filename
             if not file_path:
                 # Use artist-title as fallback to avoid empty string conflicts
-                safe_artist = (request.artist or "Unknown").replace(" ", "_").replace("/", "_")
-                safe_title = (request.title or "Unknown").replace(" ", "_").replace("/", "_")
+                safe_artist = (request.artist or "Unknown").translate(_SAFE_PATH_TABLE)
+                safe_title = (request.title or "Unknown").translate(_SAFE_PATH_TABLE)
                 file_path = f"liquidsoap://{safe_artist}-{safe_title}"
             
             # Use filename parsing as fallback for missing metadata
@@ -84,28 +226,35 @@ async def track_change_notification(
             album = request.album or filename_metadata.get('album')
             genre = request.genre or filename_metadata.get('genre')
             
-            # Try to get artwork URL
-            artwork_url = await _lookup_artwork(artist, title, album)
-            
             # Parse year as integer if provided
-            year_int = None
-            year_value = request.year or filename_metadata.get('year')
-            if year_value and str(year_value).strip() and str(year_value).strip().isdigit():
-                year_int = int(str(year_value).strip())
+            year_int = _parse_year(request.year or filename_metadata.get('year'))
             
-            track = Track(
+            # Upsert on file_path so concurrent callbacks for the same new file
+            # can't race each other into a duplicate; a row that won the race
+            # only has its missing fields filled in
+            stmt = pg_insert(Track).values(
                 title=title,
                 artist=artist,
                 album=album,
                 year=year_int,
                 genre=genre,
                 file_path=file_path,
+                basename=os.path.basename(file_path),
                 duration_sec=request.duration,
-                artwork_url=artwork_url,
                 tags=request.metadata
             )
-            db.add(track)
-            await db.flush()  # Get the ID
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Track.file_path],
+                set_={
+                    "duration_sec": func.coalesce(Track.duration_sec, stmt.excluded.duration_sec),
+                    "year": func.coalesce(Track.year, stmt.excluded.year),
+                    "genre": func.coalesce(Track.genre, stmt.excluded.genre),
+                    "updated_at": func.now(),
+                },
+            ).returning(Track)
+            track = (await db.execute(
+                stmt, execution_options={"populate_existing": True}
+            )).scalar_one()
         else:
             # Update existing track with any new metadata we received
             updated = False
@@ -113,56 +262,57 @@ async def track_change_notification(
                 track.duration_sec = request.duration
                 updated = True
             if request.year and not track.year:
-                year_int = None
-                if request.year.strip() and request.year.strip().isdigit():
-                    year_int = int(request.year.strip())
+                year_int = _parse_year(request.year)
+                if year_int:
                     track.year = year_int
                     updated = True
             if request.genre and not track.genre:
                 track.genre = request.genre
                 updated = True
-            if not track.artwork_url:
-                artwork_url = await _lookup_artwork(request.artist, request.title, request.album)
-                if artwork_url:
-                    track.artwork_url = artwork_url
-                    updated = True
 
         # Ensure the track is associated with the station that reported it
         station_identifier = (request.station or "main").lower()
-        station_obj = None
+        station_id = _station_ids.get(station_identifier)
         try:
-            station_result = await db.execute(
-                select(Station).where(func.lower(Station.identifier) == station_identifier)
-            )
-            station_obj = station_result.scalar_one_or_none()
-
-            if not station_obj:
-                # Create a lightweight station record if it doesn't exist yet
-                station_obj = Station(
+            if station_id is None:
+                station_id = (await db.execute(
+                    select(Station.id).where(func.lower(Station.identifier) == station_identifier)
+                )).scalar_one_or_none()
+
+            if station_id is None:
+                # Create a lightweight station record if it doesn't exist yet;
+                # RETURNING hands back the id without a separate flush, and a
+                # concurrent callback that created it first is simply reused
+                stmt = pg_insert(Station).values(
                     identifier=station_identifier,
                     name=station_identifier.capitalize(),
                     genre=request.genre,
                 )
-                db.add(station_obj)
-                await db.flush()
-
-            await db.refresh(track)
-            if station_obj not in track.stations:
-                track.stations.append(station_obj)
-
-            # Maintain station tags on the track for quick filtering
-            if track.tags is None:
-                track.tags = {"stations": [station_identifier]}
-            elif isinstance(track.tags, dict):
-                stations = track.tags.get("stations")
-                if isinstance(stations, list):
-                    if station_identifier not in stations:
-                        stations.append(station_identifier)
-                        track.tags["stations"] = stations
-                else:
-                    track.tags["stations"] = [station_identifier]
-            else:
-                track.tags = {"stations": [station_identifier]}
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Station.identifier],
+                    set_={"identifier": stmt.excluded.identifier},
+                ).returning(Station.id)
+                station_id = (await db.execute(stmt)).scalar_one()
+
+            # Link through the association table directly instead of
+            # refreshing the track and lazy-loading its whole stations
+            # collection (which would also discard the edits made above)
+            await db.execute(
+                pg_insert(station_tracks)
+                .values(station_id=station_id, track_id=track.id)
+                .on_conflict_do_nothing()
+            )
+
+            # Maintain station tags on the track for quick filtering; assign
+            # a new dict so the JSON column registers the change
+            tags = dict(track.tags) if isinstance(track.tags, dict) else {}
+            stations = tags.get("stations")
+            if not isinstance(stations, list):
+                tags["stations"] = [station_identifier]
+                track.tags = tags
+            elif station_identifier not in stations:
+                tags["stations"] = stations + [station_identifier]
+                track.tags = tags
         except Exception as assoc_err:
             logger.warning(
                 "Failed to associate track with station",
@@ -171,45 +321,31 @@ async def track_change_notification(
                 error=str(assoc_err),
             )
 
-        # End any current playing track
-        current_play_result = await db.execute(
-            select(Play)
-            .where(Play.ended_at.is_(None))
-            .where(func.lower(func.coalesce(Play.station_identifier, "main")) == station_identifier)
-            .order_by(Play.started_at.desc())
-            .limit(1)
-        )
-        current_play = current_play_result.scalar_one_or_none()
-        
-        if current_play:
-            current_play.ended_at = datetime.now(timezone.utc)
-            current_play.elapsed_ms = int((current_play.ended_at - current_play.started_at).total_seconds() * 1000)
-        
-        # Create new play record with station information
-        new_play = Play(
-            track_id=track.id,
-            started_at=datetime.now(timezone.utc),
-            liquidsoap_id=request.metadata.get("liquidsoap_id"),
-            source_type="playlist",
-            station_id=station_obj.id if station_obj else None,
-            station_identifier=station_identifier
-        )
-        # Station ID is now properly set from station_obj lookup
+        new_play = await _start_play(db, station_identifier, {
+            "track_id": track.id,
+            "started_at": datetime.now(timezone.utc),
+            "liquidsoap_id": request.metadata.get("liquidsoap_id"),
+            "source_type": "playlist",
+            "station_id": station_id,
+            "station_identifier": station_identifier,
+        })
+        # Station ID is now properly set from the station lookup
         request.metadata["station"] = request.station
-        db.add(new_play)
         
         # Update track statistics
         track.play_count += 1
         track.last_played_at = new_play.started_at
         
-        # Capture artwork_url before commit (async SQLAlchemy expires objects after commit)
-        artwork_url_response = track.artwork_url or ""
-
         await db.commit()
-        
-        # Broadcast to WebSocket clients
+        # Only remember the station once its row is known to be committed
+        if station_id is not None:
+            _station_ids[station_identifier] = station_id
+
+        # Broadcast to WebSocket clients once the response is on its way, so
+        # Liquidsoap's callback isn't held up by slow subscribers. Queued
+        # before the artwork job: background tasks run in order
         if websocket_manager:
-            await websocket_manager.broadcast_track_change({
+            background_tasks.add_task(websocket_manager.broadcast_track_change, {
                 "track": {
                     "id": track.id,
                     "title": track.title,
@@ -220,17 +356,24 @@ async def track_change_notification(
                 },
                 "play": {
                     "id": new_play.id,
-                    "started_at": new_play.started_at.isoformat(),
+                    "started_at": new_play.started_at,
                     "liquidsoap_id": new_play.liquidsoap_id
                 },
                 "station": request.station
             })
+
+        # Artwork lookups can take seconds; resolve them after the response
+        # and let clients patch the now-playing card when one turns up
+        if not track.artwork_url:
+            background_tasks.add_task(
+                _fetch_and_update_artwork, track.id, track.artist, track.title, track.album
+            )
         
         # Commentary generation is handled by the DJ worker service
         # which monitors track changes and generates commentary based on settings
         
         # Return artwork_url so Liquidsoap can inject it as StreamUrl in the ICY metadata
-        return {"status": "success", "track_id": track.id, "play_id": new_play.id, "artwork_url": artwork_url_response}
+        return {"status": "success", "track_id": track.id, "play_id": new_play.id, "artwork_url": track.artwork_url or ""}
         
     except Exception as e:
         logger.error("Failed to handle track change", error=str(e))
@@ -286,27 +429,12 @@ async def skip_current_track(station: str = "main", db: AsyncSession = Depends(g
             liquidsoap_host = "liquidsoap"
             liquidsoap_port = 1234
 
-        # Connect to Liquidsoap telnet and skip track
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5.0)
+        # Send skip command; matches LiquidsoapClient implementation
+        command = "music.skip"
+        response = await get_telnet_pool(liquidsoap_host, liquidsoap_port).command(command)
+        logger.info("Liquidsoap skip response", command=command, response=response)
 
-        try:
-            # Connect to Liquidsoap telnet interface
-            sock.connect((liquidsoap_host, liquidsoap_port))
-            
-            # Send skip command; matches LiquidsoapClient implementation
-            command = "music.skip\n"
-            sock.send(command.encode())
-            
-            # Read response
-            response = sock.recv(1024).decode().strip()
-            logger.info("Liquidsoap skip response", command=command.strip(), response=response)
-            
-            return {"status": "success", "message": "Track skipped", "liquidsoap_response": response}
-            
-        finally:
-            sock.close()
+        return {"status": "success", "message": "Track skipped", "liquidsoap_response": response}
         
     except Exception as e:
         logger.error("Failed to skip track", error=str(e))
@@ -336,24 +464,12 @@ async def inject_commentary_file(
             liquidsoap_port = 1234
             queue_name = "tts"
 
-        # Connect to Liquidsoap telnet and inject TTS audio
-        import socket
-
-        def ls_cmd(host, port, cmd, timeout=5.0):
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(timeout)
-            try:
-                s.connect((host, port))
-                s.send(f"{cmd}\n".encode())
-                resp = s.recv(4096).decode(errors="ignore").strip()
-                return resp
-            finally:
-                s.close()
-
         # Guard: only inject if the TTS queue is currently empty to avoid
         # back-to-back commentaries causing wrong track pairings.
         try:
-            queued_resp = ls_cmd(liquidsoap_host, liquidsoap_port, f"{queue_name}.queue")
+            queued_resp = await get_telnet_pool(liquidsoap_host, liquidsoap_port).command(
+                f"{queue_name}.queue"
+            )
             # Response is space-separated RIDs or empty
             queued_rids = [r for r in queued_resp.split() if r.isdigit()]
             if queued_rids:
@@ -366,42 +482,251 @@ async def inject_commentary_file(
         except Exception as qcheck_err:
             logger.warning("Could not check TTS queue before injection; proceeding anyway", error=str(qcheck_err))
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5.0)
+        # Push the commentary file to TTS queue
+        command = f"{queue_name}.push /shared/tts/{filename}"
+        response = await get_telnet_pool(liquidsoap_host, liquidsoap_port).command(command)
+        logger.info("Liquidsoap response", command=command, response=response)
 
-        try:
-            # Connect to Liquidsoap telnet interface
-            sock.connect((liquidsoap_host, liquidsoap_port))
-
-            # Push the commentary file to TTS queue
-            command = f"{queue_name}.push /shared/tts/{filename}\n"
-            sock.send(command.encode())
-            
-            # Read response
-            response = sock.recv(1024).decode().strip()
-            logger.info("Liquidsoap response", command=command.strip(), response=response)
-            
-            return {"status": "success", "message": f"Commentary {filename} injected into stream", "liquidsoap_response": response}
-            
-        finally:
-            sock.close()
+        return {"status": "success", "message": f"Commentary {filename} injected into stream", "liquidsoap_response": response}
         
     except Exception as e:
         logger.error("Failed to inject commentary", error=str(e), filename=filename)
         raise HTTPException(status_code=500, detail=f"Failed to inject commentary: {str(e)}")
 
+async def _fetch_and_update_artwork(
+    track_id: int, artist: Optional[str], title: Optional[str], album: Optional[str] = None
+):
+    """Background task: store looked-up artwork on a track and announce it"""
+    try:
+        artwork_url = await _lookup_artwork(artist, title, album)
+        if not artwork_url:
+            return
+
+        async with get_db_session() as db:
+            result = await db.execute(
+                update(Track)
+                .where(Track.id == track_id)
+                .where(or_(Track.artwork_url.is_(None), Track.artwork_url == ""))
+                .values(artwork_url=artwork_url)
+                .returning(Track.id)
+            )
+            if result.scalar_one_or_none() is None:
+                return
+            await db.commit()
+
+        if websocket_manager:
+            await websocket_manager.broadcast_track_artwork({
+                "track_id": track_id,
+                "artwork_url": artwork_url,
+            })
+    except Exception as e:
+        logger.warning("Background artwork lookup failed", track_id=track_id, error=str(e))
+
+
 async def _lookup_artwork(artist: Optional[str], title: Optional[str], album: Optional[str] = None) -> Optional[str]:
-    """Lookup album artwork.
+    """Lookup album artwork, cached by normalized (artist, title, album).
 
-    Order:
-    1) iTunes Search API (album preferred, then song)
-    2) MusicBrainz + Cover Art Archive fallback
+    Concurrent lookups of the same track share one set of HTTP requests.
     """
     if not artist or not title:
         return None
-        
+
+    key = (artist.lower().strip(), title.lower().strip(), (album or "").lower().strip())
+    if key in _artwork_cache:
+        return _artwork_cache[key]
+    if key in _artwork_miss_cache:
+        return None
+
+    inflight = _artwork_inflight.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_fetch_artwork_shared(key, artist, title, album))
+        _artwork_inflight[key] = inflight
+        inflight.add_done_callback(lambda _: _artwork_inflight.pop(key, None))
+
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        artwork_url = await asyncio.shield(inflight)
+    except _ArtworkUpstreamUnavailable:
+        # Not a real miss; try again on the next play
+        return None
+    if artwork_url:
+        _artwork_cache[key] = artwork_url
+    else:
+        _artwork_miss_cache[key] = True
+    return artwork_url
+
+
+async def _fetch_artwork_shared(
+    key: tuple, artist: str, title: str, album: Optional[str] = None
+) -> Optional[str]:
+    """Fetch artwork through the Redis tier shared by all API workers (when
+    configured), going to the network only on a Redis miss."""
+    redis = get_redis()
+    # Hashed to keep keys short; joined on a control character that can't
+    # appear in tag text, so names containing "|" don't collide
+    redis_key = "art:" + hashlib.sha1("\x1f".join(key).encode()).hexdigest()
+    if redis is not None:
+        try:
+            cached = await redis.get(redis_key)
+        except Exception as e:
+            logger.debug("Redis artwork cache read failed", error=str(e))
+            cached = None
+        if cached is not None:
+            # "" marks a remembered miss
+            return cached or None
+
+    artwork_url = await _fetch_artwork(artist, title, album)
+
+    if redis is not None:
+        try:
+            await redis.set(
+                redis_key,
+                artwork_url or "",
+                ex=ARTWORK_REDIS_TTL_SECONDS if artwork_url else ARTWORK_MISS_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.debug("Redis artwork cache write failed", error=str(e))
+    return artwork_url
+
+
+class _ArtworkUpstreamUnavailable(Exception):
+    """No artwork found, but only because an upstream failed or was skipped;
+    the miss shouldn't be cached."""
+
+
+class _CircuitBreaker:
+    """Skip an artwork upstream for a while after repeated consecutive failures,
+    so track changes don't each wait out its timeout while it's down."""
+
+    def __init__(self, name: str, max_failures: int = 5, open_seconds: float = 60.0):
+        self.name = name
+        self.max_failures = max_failures
+        self.open_seconds = open_seconds
+        self._failures = 0
+        self._open_until = 0.0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.max_failures:
+            self._failures = 0
+            self._open_until = time.monotonic() + self.open_seconds
+            logger.warning("Artwork upstream failing; skipping it for a while",
+                           upstream=self.name, seconds=self.open_seconds)
+
+
+_itunes_breaker = _CircuitBreaker("itunes")
+_musicbrainz_breaker = _CircuitBreaker("musicbrainz")
+_caa_breaker = _CircuitBreaker("coverartarchive")
+
+
+@contextlib.asynccontextmanager
+async def _upstream_slot(slots: asyncio.Semaphore, upstream: str):
+    """Hold one of an upstream's concurrency slots, noting slow waits"""
+    started = time.monotonic()
+    async with slots:
+        waited = time.monotonic() - started
+        if waited > UPSTREAM_SLOT_WAIT_LOG_SECONDS:
+            logger.info("Waited for artwork upstream slot", upstream=upstream,
+                        waited_ms=round(waited * 1000))
+        yield
+
+
+async def _first_caa_front(mbids: List[Optional[str]]) -> Optional[str]:
+    """Probe Cover Art Archive front covers for several releases at once and
+    return the first that serves an image, cancelling the rest.
+
+    Raises _ArtworkUpstreamUnavailable when nothing was found and probes
+    failed (or the breaker is open).
+    """
+    urls = [
+        f"https://coverartarchive.org/release/{mbid}/front-500"
+        for mbid in dict.fromkeys(mbids)
+        if mbid
+    ]
+    if not urls:
+        return None
+    if _caa_breaker.is_open():
+        raise _ArtworkUpstreamUnavailable(_caa_breaker.name)
+
+    async def probe(url: str) -> Optional[str]:
+        try:
+            # HEAD is enough to tell whether a cover exists; CAA answers with
+            # a redirect to archive.org, which has to be followed
+            async with _upstream_slot(_caa_slots, _caa_breaker.name):
+                resp = await get_http_client().head(
+                    url, follow_redirects=True, timeout=ARTWORK_HTTP_TIMEOUT
+                )
+        except Exception:
+            _caa_breaker.record_failure()
+            raise
+        _caa_breaker.record_success()
+        if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
+            return url
+        return None
+
+    failed = False
+    tasks = [asyncio.ensure_future(probe(url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=CAA_PROBE_BUDGET_SECONDS):
+            try:
+                url = await next_done
+            except asyncio.TimeoutError:
+                raise  # overall budget spent, handled below
+            except Exception:
+                failed = True
+                continue
+            if url:
+                return url
+    except asyncio.TimeoutError:
+        logger.debug("Cover Art Archive probes timed out", candidates=len(urls))
+        _caa_breaker.record_failure()
+        failed = True
+    finally:
+        for task in tasks:
+            task.cancel()
+    if failed:
+        raise _ArtworkUpstreamUnavailable(_caa_breaker.name)
+    return None
+
+
+async def _mb_search(entity: str, **fields: str) -> dict:
+    """MusicBrainz search for the artwork fallback, tracked by its breaker"""
+    if _musicbrainz_breaker.is_open():
+        raise _ArtworkUpstreamUnavailable(_musicbrainz_breaker.name)
+    try:
+        res = await mb_get(
+            entity, {"query": mb_search_query(**fields), "limit": 3},
+            timeout=ARTWORK_HTTP_TIMEOUT,
+        )
+    except Exception as e:
+        _musicbrainz_breaker.record_failure()
+        raise _ArtworkUpstreamUnavailable(_musicbrainz_breaker.name) from e
+    _musicbrainz_breaker.record_success()
+    return res
+
+
+def _artist_match_key(name: str) -> str:
+    """Normalize an artist name for loose comparison (compatibility forms, case)"""
+    return unicodedata.normalize("NFKD", name).casefold()
+
+
+async def _fetch_artwork(artist: str, title: str, album: Optional[str] = None) -> Optional[str]:
+    """Fetch album artwork from the network.
+
+    Order:
+    1) iTunes Search API (album preferred, then song)
+    2) MusicBrainz + Cover Art Archive fallback, when iTunes is failing
+
+    Raises _ArtworkUpstreamUnavailable if nothing was found and an upstream
+    failed or was skipped by its circuit breaker.
+    """
+    if not _itunes_breaker.is_open():
+        try:
             # Use album if available, otherwise search by artist + title
             if album:
                 query = f"{artist} {album}"
@@ -416,17 +741,24 @@ async def _lookup_artwork(artist: Optional[str], title: Optional[str], album: Op
                 "limit": 3
             }
             
-            response = await client.get("https://itunes.apple.com/search", params=params)
-            if response.status_code != 200:
-                return None
-            
+            async with _upstream_slot(_itunes_slots, _itunes_breaker.name):
+                response = await get_http_client().get(
+                    "https://itunes.apple.com/search", params=params, timeout=ARTWORK_HTTP_TIMEOUT
+                )
+            response.raise_for_status()
             data = response.json()
+        except Exception as e:
+            _itunes_breaker.record_failure()
+            logger.debug("Artwork lookup via iTunes failed", error=str(e))
+        else:
+            _itunes_breaker.record_success()
             results = data.get("results", [])
             
+            artist_key = _artist_match_key(artist)
             for result in results:
                 # Check if it's a reasonable match
-                result_artist = result.get("artistName", "").lower()
-                if artist.lower() in result_artist or result_artist in artist.lower():
+                result_artist = _artist_match_key(result.get("artistName", ""))
+                if artist_key in result_artist or result_artist in artist_key:
                     artwork_url = result.get("artworkUrl100")
                     if artwork_url:
                         # Get higher resolution version
@@ -436,49 +768,31 @@ async def _lookup_artwork(artist: Optional[str], title: Optional[str], album: Op
             
             return None
 
-    except Exception as e:
-        logger.debug("Artwork lookup via iTunes failed", error=str(e))
-
     # Fallback to MusicBrainz + Cover Art Archive
     try:
-        import musicbrainzngs
-        musicbrainzngs.set_useragent("Raido", "1.0", "https://raido.local")
-
         # Prefer album-based search first if available
         if album:
-            res = musicbrainzngs.search_releases(artist=artist, release=album, limit=3)
-            for rel in res.get("release-list", []) or []:
-                mbid = rel.get("id")
-                if not mbid:
-                    continue
-                url = f"https://coverartarchive.org/release/{mbid}/front-500"
-                try:
-                    async with httpx.AsyncClient(timeout=5.0) as client:
-                        resp = await client.get(url)
-                        if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                            logger.debug("Found artwork via CAA (album)", url=url)
-                            return url
-                except Exception:
-                    pass
+            res = await _mb_search("release", artist=artist, release=album)
+            url = await _first_caa_front([rel.get("id") for rel in res.get("releases") or []])
+            if url:
+                logger.debug("Found artwork via CAA (album)", url=url)
+                return url
 
         # Recording-based fallback
-        res = musicbrainzngs.search_recordings(artist=artist, recording=title, limit=3)
-        for rec in res.get("recording-list", []) or []:
-            for rel in rec.get("release-list", []) or []:
-                mbid = rel.get("id")
-                if not mbid:
-                    continue
-                url = f"https://coverartarchive.org/release/{mbid}/front-500"
-                try:
-                    async with httpx.AsyncClient(timeout=5.0) as client:
-                        resp = await client.get(url)
-                        if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                            logger.debug("Found artwork via CAA (recording)", url=url)
-                            return url
-                except Exception:
-                    pass
-
+        res = await _mb_search("recording", artist=artist, recording=title)
+        url = await _first_caa_front([
+            rel.get("id")
+            for rec in res.get("recordings") or []
+            for rel in rec.get("releases") or []
+        ])
+        if url:
+            logger.debug("Found artwork via CAA (recording)", url=url)
+            return url
+
+    except _ArtworkUpstreamUnavailable:
+        raise
     except Exception as e:
         logger.debug("MusicBrainz lookup failed", error=str(e))
 
-    return None
+    # iTunes failed or was skipped to get here
+    raise _ArtworkUpstreamUnavailable(_itunes_breaker.name)
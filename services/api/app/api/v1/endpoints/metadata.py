@@ -5,20 +5,24 @@ Provides endpoints for scanning audio files and extracting comprehensive metadat
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import String, any_, func, literal, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 import structlog
 from pathlib import Path
 import os
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_session
 from app.models import Track
-from app.services.metadata_extractor import MetadataExtractor
+from app.services.metadata_extractor import FileStat, MetadataExtractor
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Files written per INSERT ... ON CONFLICT statement (and commit) during scans
+SCAN_UPSERT_BATCH_SIZE = 500
+
 
 class MetadataExtractRequest(BaseModel):
     """Request model for metadata extraction"""
@@ -40,8 +44,7 @@ class MetadataResponse(BaseModel):
 @router.post("/extract", response_model=MetadataResponse)
 async def extract_metadata(
     request: MetadataExtractRequest,
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """
     Extract metadata from audio files and update the database.
@@ -61,8 +64,7 @@ async def extract_metadata(
             background_tasks.add_task(
                 _extract_single_file,
                 request.file_path,
-                request.update_existing,
-                db
+                request.update_existing
             )
             return MetadataResponse(
                 status="started",
@@ -76,8 +78,7 @@ async def extract_metadata(
                 _extract_directory,
                 request.directory_path,
                 request.recursive,
-                request.update_existing,
-                db
+                request.update_existing
             )
             return MetadataResponse(
                 status="started",
@@ -205,7 +206,7 @@ async def refresh_file_metadata(
             raise HTTPException(status_code=404, detail="Audio file not found")
         
         # Start metadata refresh in background
-        background_tasks.add_task(_refresh_track_metadata, track.id, track.file_path, db)
+        background_tasks.add_task(_refresh_track_metadata, track.id, track.file_path)
         
         return {
             "status": "started",
@@ -218,7 +219,7 @@ async def refresh_file_metadata(
         raise HTTPException(status_code=500, detail=f"Failed to start refresh: {str(e)}")
 
 
-async def _extract_single_file(file_path: str, update_existing: bool, db: AsyncSession):
+async def _extract_single_file(file_path: str, update_existing: bool):
     """Background task to extract metadata from a single file"""
     try:
         logger.info("Starting single file metadata extraction", file_path=file_path)
@@ -228,74 +229,113 @@ async def _extract_single_file(file_path: str, update_existing: bool, db: AsyncS
             logger.warning("No metadata extracted", file_path=file_path)
             return
         
-        await _update_or_create_track(metadata, update_existing, db)
-        await db.commit()
+        # Background tasks outlive the request's session; use our own
+        async with get_db_session() as db:
+            await _upsert_tracks([metadata], update_existing, db)
+            await db.commit()
         
         logger.info("Completed single file extraction", file_path=file_path)
         
     except Exception as e:
         logger.error("Failed single file extraction", file_path=file_path, error=str(e))
-        await db.rollback()
 
 
-async def _extract_directory(directory_path: str, recursive: bool, update_existing: bool, db: AsyncSession):
+async def _extract_directory(directory_path: str, recursive: bool, update_existing: bool):
     """Background task to extract metadata from a directory"""
-    try:
-        logger.info("Starting directory metadata extraction", 
-                   directory=directory_path, recursive=recursive)
-        
-        metadata_list = await MetadataExtractor.scan_directory(directory_path, recursive)
-        
-        files_processed = 0
-        files_updated = 0
-        files_created = 0
-        
-        for metadata in metadata_list:
-            try:
-                result = await _update_or_create_track(metadata, update_existing, db)
-                files_processed += 1
-                if result == "updated":
-                    files_updated += 1
-                elif result == "created":
-                    files_created += 1
-                    
-                # Commit in batches to avoid memory issues
-                if files_processed % 50 == 0:
+    # Background tasks outlive the request's session; use our own
+    async with get_db_session() as db:
+        try:
+            logger.info("Starting directory metadata extraction", 
+                       directory=directory_path, recursive=recursive)
+            
+            files_processed = 0
+            files_updated = 0
+            files_created = 0
+            errors: List[str] = []
+            
+            async def store(batch: List[Dict[str, Any]]):
+                nonlocal files_processed, files_updated, files_created
+                try:
+                    # A scan can simply be re-run after a crash, so its commits
+                    # needn't wait for the WAL flush (this transaction only)
+                    await db.execute(text("SET LOCAL synchronous_commit = off"))
+                    created, updated = await _upsert_tracks(batch, update_existing, db)
                     await db.commit()
-                    logger.info("Batch commit", processed=files_processed)
-                    
-            except Exception as e:
-                logger.error("Failed to process file metadata", 
-                           file_path=metadata.get('file_path'), error=str(e))
-                continue
-        
-        await db.commit()
-        
-        logger.info("Completed directory extraction", 
-                   directory=directory_path, 
-                   processed=files_processed,
-                   updated=files_updated,
-                   created=files_created)
+                except Exception as e:
+                    await db.rollback()
+                    logger.warning("Metadata batch failed; storing its files one by one",
+                                 first_file=batch[0].get('file_path'), size=len(batch), error=str(e))
+                    created = updated = 0
+                    stored = []
+                    for metadata in batch:
+                        try:
+                            file_created, file_updated = await _upsert_tracks([metadata], update_existing, db)
+                            await db.commit()
+                        except Exception as file_err:
+                            await db.rollback()
+                            logger.error("Failed to process file metadata",
+                                       file_path=metadata.get('file_path'), error=str(file_err))
+                            errors.append(f"{metadata.get('file_path')}: {file_err}")
+                            continue
+                        stored.append(metadata)
+                        created += file_created
+                        updated += file_updated
+                    batch = stored
+                files_processed += len(batch)
+                files_created += created
+                files_updated += updated
+                logger.info("Batch commit", processed=files_processed)
+            
+            async def skip_files(files: List[FileStat]) -> Set[str]:
+                # Known files are left alone entirely without update_existing,
+                # otherwise only those whose size and mtime haven't changed
+                try:
+                    result = await db.execute(
+                        select(Track.file_path, Track.file_size, Track.file_mtime_ns)
+                        .where(Track.file_path == any_(literal([path for path, _, _ in files], ARRAY(String))))
+                    )
+                    stored = {path: (size, mtime_ns) for path, size, mtime_ns in result.all()}
+                finally:
+                    # End the read's transaction so the session doesn't sit idle
+                    # in transaction, holding a pooled connection, while files parse
+                    await db.rollback()
+                return {
+                    path for path, size, mtime_ns in files
+                    if path in stored and (not update_existing or stored[path] == (size, mtime_ns))
+                }
+            
+            # Store files as they're parsed rather than after the whole walk
+            batch: List[Dict[str, Any]] = []
+            async for metadata in MetadataExtractor.iter_directory(
+                directory_path, recursive, skip_files=skip_files
+            ):
+                batch.append(metadata)
+                if len(batch) >= SCAN_UPSERT_BATCH_SIZE:
+                    await store(batch)
+                    batch = []
+            if batch:
+                await store(batch)
+            
+            logger.info("Completed directory extraction", 
+                       directory=directory_path, 
+                       processed=files_processed,
+                       updated=files_updated,
+                       created=files_created,
+                       failed=len(errors),
+                       errors=errors[:20])
         
-    except Exception as e:
-        logger.error("Failed directory extraction", 
-                    directory=directory_path, error=str(e))
-        await db.rollback()
+        except Exception as e:
+            logger.error("Failed directory extraction", 
+                        directory=directory_path, error=str(e))
+            await db.rollback()
 
 
 async def _scan_music_library(music_dir: str, update_existing: bool):
     """Background task to scan the main music library"""
-    try:
-        from app.core.database import get_db_session
-        
-        async with get_db_session() as db:
-            await _extract_directory(music_dir, True, update_existing, db)
-            
-    except Exception as e:
-        logger.error("Failed music library scan", directory=music_dir, error=str(e))
+    await _extract_directory(music_dir, True, update_existing)
 
 
-async def _refresh_track_metadata(track_id: int, file_path: str, db: AsyncSession):
+async def _refresh_track_metadata(track_id: int, file_path: str):
     """Background task to refresh metadata for a specific track"""
     try:
         logger.info("Starting metadata refresh", track_id=track_id, file_path=file_path)
@@ -306,54 +346,91 @@ async def _refresh_track_metadata(track_id: int, file_path: str, db: AsyncSessio
             return
         
         # Update the specific track
-        result = await db.execute(select(Track).where(Track.id == track_id))
-        track = result.scalar_one_or_none()
-        
-        if track:
-            _update_track_from_metadata(track, metadata)
-            await db.commit()
-            logger.info("Completed metadata refresh", track_id=track_id)
-        else:
-            logger.warning("Track not found during refresh", track_id=track_id)
+        async with get_db_session() as db:
+            result = await db.execute(select(Track).where(Track.id == track_id))
+            track = result.scalar_one_or_none()
+            
+            if track:
+                _update_track_from_metadata(track, metadata)
+                await db.commit()
+                logger.info("Completed metadata refresh", track_id=track_id)
+            else:
+                logger.warning("Track not found during refresh", track_id=track_id)
         
     except Exception as e:
         logger.error("Failed metadata refresh", track_id=track_id, error=str(e))
-        await db.rollback()
 
 
-async def _update_or_create_track(metadata: Dict[str, Any], update_existing: bool, db: AsyncSession) -> str:
-    """Update existing track or create new one from metadata"""
-    
-    file_path = metadata.get('file_path')
-    if not file_path:
-        return "skipped"
-    
-    # Look for existing track by file path
-    result = await db.execute(
-        select(Track).where(Track.file_path == file_path)
-    )
-    track = result.scalar_one_or_none()
+async def _upsert_tracks(metadata_list: List[Dict[str, Any]], update_existing: bool, db: AsyncSession) -> Tuple[int, int]:
+    """Insert or update tracks from extracted metadata in one statement.
+
+    Returns (created, updated) counts. Existing rows only change when
+    update_existing is set, and then only for fields the metadata has,
+    like _update_track_from_metadata.
+    """
+    rows = {}
+    for metadata in metadata_list:
+        file_path = metadata.get('file_path')
+        if not file_path:
+            continue
+        rows[file_path] = {
+            "title": _fit_column("title", metadata.get('title') or 'Unknown Title'),
+            "artist": _fit_column("artist", metadata.get('artist') or 'Unknown Artist'),
+            "album": _fit_column("album", metadata.get('album') or None),
+            "year": metadata.get('year') or None,
+            "genre": _fit_column("genre", metadata.get('genre') or None),
+            "file_path": file_path,
+            "basename": os.path.basename(file_path),
+            "duration_sec": metadata.get('duration_sec') or None,
+            "file_size": metadata.get('file_size_bytes'),
+            "file_mtime_ns": metadata.get('file_mtime_ns'),
+            "tags": metadata,
+        }
+    if not rows:
+        return 0, 0
     
-    if track:
-        if update_existing:
-            _update_track_from_metadata(track, metadata)
-            return "updated"
-        else:
-            return "skipped"
-    else:
-        # Create new track
-        track = Track(
-            title=metadata.get('title', 'Unknown Title'),
-            artist=metadata.get('artist', 'Unknown Artist'),
-            album=metadata.get('album'),
-            year=metadata.get('year'),
-            genre=metadata.get('genre'),
-            file_path=file_path,
-            duration_sec=metadata.get('duration_sec'),
-            tags=metadata
+    stmt = pg_insert(Track).values(list(rows.values()))
+    if update_existing:
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Track.file_path],
+            set_={
+                # The 'Unknown ...' placeholders are for new rows only; read
+                # the real tag back so a missing one keeps the stored value
+                "title": func.coalesce(
+                    func.left(func.nullif(excluded.tags["title"].as_string(), ""), Track.title.type.length),
+                    Track.title,
+                ),
+                "artist": func.coalesce(
+                    func.left(func.nullif(excluded.tags["artist"].as_string(), ""), Track.artist.type.length),
+                    Track.artist,
+                ),
+                "album": func.coalesce(excluded.album, Track.album),
+                "year": func.coalesce(excluded.year, Track.year),
+                "genre": func.coalesce(excluded.genre, Track.genre),
+                "duration_sec": func.coalesce(excluded.duration_sec, Track.duration_sec),
+                "tags": excluded.tags,
+                "file_size": excluded.file_size,
+                "file_mtime_ns": excluded.file_mtime_ns,
+                "updated_at": func.now(),
+            },
         )
-        db.add(track)
-        return "created"
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Track.file_path])
+    # xmax is 0 only on freshly inserted rows
+    result = await db.execute(stmt.returning(literal_column("xmax = 0")))
+    inserted = result.scalars().all()
+    created = sum(1 for flag in inserted if flag)
+    return created, len(inserted) - created
+
+
+def _fit_column(name: str, value: Optional[str]) -> Optional[str]:
+    """Cut a tag value down to its Track column's length, so one oversized tag
+    can't fail a whole batched insert"""
+    length = Track.__table__.c[name].type.length
+    if value is not None and length is not None:
+        value = str(value)[:length]
+    return value
 
 
 def _update_track_from_metadata(track: Track, metadata: Dict[str, Any]):
@@ -1,14 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Request
+import asyncio
+import hashlib
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, update, func
-from typing import Optional, Dict, Any
+from sqlalchemy import select, desc, update, func, true
+from sqlalchemy.orm import aliased
+from typing import Optional, Dict, Any, Tuple
 import structlog
 from pathlib import Path
 
 from app.core.database import AsyncSessionLocal, get_db
 from app.models import Track, Play, Commentary, Station
 from app.schemas.stream import NowPlayingResponse, HistoryResponse, NextUpResponse
-from app.services.liquidsoap_client import LiquidsoapClient
+from app.services.liquidsoap_client import AsyncLiquidsoapClient
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -21,24 +27,52 @@ STATION_LIQUIDSOAP_CONFIG = {
     "newreleases": {"host": "newreleases-liquidsoap", "port": 1237},
 }
 
-def get_liquidsoap_client(station: str = "main") -> LiquidsoapClient:
-    """Get LiquidsoapClient configured for the specified station"""
+def get_liquidsoap_client(station: str = "main") -> AsyncLiquidsoapClient:
+    """Get a Liquidsoap client configured for the specified station"""
     config = STATION_LIQUIDSOAP_CONFIG.get(station, STATION_LIQUIDSOAP_CONFIG["main"])
-    return LiquidsoapClient(host=config["host"], port=config["port"])
+    return AsyncLiquidsoapClient(host=config["host"], port=config["port"])
+
+# Every open player polls now-playing about once a second; compose each
+# station's answer at most once per TTL per worker
+NOW_PLAYING_CACHE_TTL_SECONDS = 1.0
+_now_playing_cache: TTLCache = TTLCache(maxsize=64, ttl=NOW_PLAYING_CACHE_TTL_SECONDS)
+
+
+async def _now_playing_cached(station: str) -> Tuple[NowPlayingResponse, str]:
+    """Now-playing response for a station and its ETag, briefly cached"""
+    cached = _now_playing_cache.get(station)
+    if cached is None:
+        now = await _compose_now_playing(station)
+        digest = hashlib.sha1(orjson.dumps(now.model_dump(mode="json"))).hexdigest()
+        cached = _now_playing_cache[station] = (now, f'W/"{digest}"')
+    return cached
+
 
 @router.get("/", response_model=NowPlayingResponse)
-async def get_now_playing(station: str = Query("main", description="Station identifier (main, christmas, etc.)")):
+async def get_now_playing(
+    request: Request,
+    response: Response,
+    station: str = Query("main", description="Station identifier (main, christmas, etc.)"),
+):
     """Get currently playing track information for a specific station"""
+    now, etag = await _now_playing_cached(station)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return now
+
+
+async def _compose_now_playing(station: str) -> NowPlayingResponse:
     try:
         station_normalized = (station or "main").lower()
         # Try to read current directly from Liquidsoap (more accurate)
         try:
             client = get_liquidsoap_client(station)
-            rids = client.list_request_ids()
+            rids = await client.list_request_ids()
             sorted_rids = sorted(rids)
             current_rid = sorted_rids[0] if sorted_rids else None
             if current_rid is not None:
-                ls_meta = client.get_request_metadata(current_rid)
+                ls_meta = await client.get_request_metadata(current_rid)
 
                 if (ls_meta.get('source') or '').lower() != 'tts':
                     filename = ls_meta.get("filename") or ls_meta.get("initial_uri")
@@ -246,7 +280,7 @@ async def get_now_playing_meta(request: Request, station: str = Query("main")):
     """Flat now-playing response with absolute artwork URL — for Triode / Shortcuts / external clients."""
     try:
         base = str(request.base_url).rstrip("/")
-        now = await get_now_playing(station=station)
+        now, _ = await _now_playing_cached(station)
         track = now.track
         if not track:
             return {"title": "", "artist": "", "album": "", "artwork": ""}
@@ -307,8 +341,8 @@ async def get_next_up(
         # Inspect Liquidsoap request queue and build next N items.
         # Use metadata-aware current/next detection so we don't skip the
         # actual next track by blindly assuming the lowest RID is current.
-        rids = client.list_request_ids()
-        current_rid, _ = client.get_current_and_next_ready_rid(rids)
+        rids = await client.list_request_ids()
+        current_rid, _ = await client.get_current_and_next_ready_rid(rids)
         sorted_rids = sorted(rids)
         next_rids: list[int] = []
         if current_rid is not None:
@@ -325,7 +359,7 @@ async def get_next_up(
             cumulative = base_remaining if base_now else 0.0
 
             for rid in next_rids:
-                ls_meta = client.get_request_metadata(rid)
+                ls_meta = await client.get_request_metadata(rid)
                 # Map to DB
                 filename = ls_meta.get("filename") or ls_meta.get("initial_uri")
                 track: Optional[Track] = None
@@ -365,7 +399,7 @@ async def get_next_up(
                         try:
                             # First try ID3 extraction (fast, local)
                             from app.api.v1.endpoints.artwork import _extract_artwork_from_file
-                            artwork_data, mime_type = await _extract_artwork_from_file(track.file_path)
+                            artwork_data, mime_type = await asyncio.to_thread(_extract_artwork_from_file, track.file_path)
                             if artwork_data:
                                 artwork_dir = Path("/shared/artwork")
                                 artwork_dir.mkdir(exist_ok=True)
@@ -555,9 +589,20 @@ async def get_play_history(
     try:
         station_normalized = (station or "main").lower()
 
+        # At most one ready commentary per play, joined in the same query
+        ready_commentary = (
+            select(Commentary)
+            .where(Commentary.play_id == Play.id)
+            .where(Commentary.status == "ready")
+            .limit(1)
+            .lateral("ready_commentary")
+        )
+        commentary_alias = aliased(Commentary, ready_commentary)
+
         query = (
-            select(Play, Track)
+            select(Play, Track, commentary_alias)
             .join(Track, Play.track_id == Track.id)
+            .outerjoin(ready_commentary, true())
             .where(Play.ended_at.is_not(None))
         )
 
@@ -576,16 +621,7 @@ async def get_play_history(
         result = await db.execute(query)
         
         history = []
-        for play, track in result.all():
-            # Get any commentary associated with this play
-            commentary_result = await db.execute(
-                select(Commentary)
-                .where(Commentary.play_id == play.id)
-                .where(Commentary.status == "ready")
-                .limit(1)
-            )
-            commentary = commentary_result.scalar_one_or_none()
-            
+        for play, track, commentary in result.all():
             history.append({
                 "track": {
                     "id": track.id,
@@ -6,9 +6,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, distinct, or_
 import structlog
-import httpx
 
 from app.core.database import get_db
+from app.core.http_client import get_http_client
 from app.models import Track
 from app.models import Station
 from app.models.stations import station_tracks
@@ -131,19 +131,21 @@ async def get_track(track_id: int, db: AsyncSession = Depends(get_db)):
 
 
 
-_NON_GENRE_TAGS = {
+# Lowercase; compare against tag.lower()
+_NON_GENRE_TAGS: frozenset[str] = frozenset({
     "animal on cover", "dog on cover", "cat on cover", "energetic", "playful",
     "melancholic", "uplifting", "eclectic", "melodic", "sarcastic", "satirical",
     "quirky", "urban", "aggressive", "dark", "romantic", "happy", "sad",
     "instrumental", "live", "compilation", "reissue", "remixed",
-}
+})
 
 def _top_genre_from_tags(tags: list) -> Optional[str]:
-    filtered = [t for t in tags if t.get("name", "").lower() not in _NON_GENRE_TAGS]
-    if not filtered:
-        return None
-    top = max(filtered, key=lambda t: int(t.get("count", 0)))
-    return top["name"].title()
+    top = max(
+        (t for t in tags if t.get("name", "").lower() not in _NON_GENRE_TAGS),
+        key=lambda t: int(t.get("count", 0)),
+        default=None,
+    )
+    return top["name"].title() if top else None
 
 def _sync_mb_search(artist: str, title: str) -> dict:
     """Synchronous MusicBrainz search — run in executor to avoid blocking the event loop."""
@@ -207,10 +209,9 @@ async def search_musicbrainz(track_id: int, db: AsyncSession = Depends(get_db)):
         if release_mbid:
             caa_url = f"https://coverartarchive.org/release/{release_mbid}/front-500"
             try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    resp = await client.get(caa_url, follow_redirects=True)
-                    if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
-                        artwork_url = str(resp.url)
+                resp = await get_http_client().get(caa_url, follow_redirects=True, timeout=5.0)
+                if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("image/"):
+                    artwork_url = str(resp.url)
             except Exception:
                 pass
 
@@ -231,15 +232,15 @@ async def search_musicbrainz(track_id: int, db: AsyncSession = Depends(get_db)):
     first_mbid = next((c.release_mbid for c in candidates if c.release_mbid), None)
     if first_mbid:
         try:
-            async with httpx.AsyncClient(timeout=5.0, headers={"User-Agent": "Raido/1.0 (raido@bhsuarez.com)"}) as client:
-                resp = await client.get(
-                    f"https://musicbrainz.org/ws/2/release/{first_mbid}",
-                    params={"inc": "tags release-groups", "fmt": "json"},
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    all_tags = data.get("tags", []) + data.get("release-group", {}).get("tags", [])
-                    genre = _top_genre_from_tags(all_tags)
+            resp = await get_http_client().get(
+                f"https://musicbrainz.org/ws/2/release/{first_mbid}",
+                params={"inc": "tags release-groups", "fmt": "json"},
+                timeout=5.0,
+            )
+            if resp.status_code == 200:
+                data = resp.json()
+                all_tags = data.get("tags", []) + data.get("release-group", {}).get("tags", [])
+                genre = _top_genre_from_tags(all_tags)
         except Exception:
             pass
 
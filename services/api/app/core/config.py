@@ -10,6 +10,17 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "postgresql+asyncpg://raido:password@db:5432/raido"
+    # Per worker process; keep workers * (size + overflow) under Postgres max_connections
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds to wait for a pooled connection before failing the request
+    DB_POOL_TIMEOUT: float = 5.0
+    # Let PgBouncer (transaction mode) do the pooling instead
+    DB_USE_NULL_POOL: bool = False
+
+    # Optional Redis (e.g. redis://redis:6379/0) for caches shared across
+    # API workers and restarts; unset keeps caching in-process only
+    REDIS_URL: Optional[str] = None
     
     # Security
     JWT_SECRET: str = "your-super-secret-jwt-signing-key-minimum-32-chars"
@@ -18,6 +29,9 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 90
     SESSION_SECRET: str = "your-session-secret-key-here"
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
+    # Comma-separated IPs/CIDRs of reverse proxies whose X-Forwarded-For is
+    # believed (e.g. 172.16.0.0/12); unset keys clients on the socket peer
+    TRUSTED_PROXIES: str = ""
     
     # Anthropic
     ANTHROPIC_API_KEY: Optional[str] = None
@@ -1,16 +1,25 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import MetaData
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
 # Create async engine
+if settings.DB_USE_NULL_POOL:
+    _pool_options = {"poolclass": NullPool}
+else:
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.APP_DEBUG,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **_pool_options,
 )
 
 # Create async session factory
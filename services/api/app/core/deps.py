@@ -1,4 +1,5 @@
 """FastAPI dependencies for authentication."""
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
@@ -11,12 +12,22 @@ from app.models.users import User
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Token -> User, so admin pages polling several endpoints don't look the user
+# up on every request. A deactivated or demoted user keeps access for at most
+# this long.
+USER_CACHE_TTL_SECONDS = 30
+_user_cache: TTLCache = TTLCache(maxsize=1024, ttl=USER_CACHE_TTL_SECONDS)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    """Decode JWT and return the authenticated user. Raises 401 if invalid."""
+    """Decode JWT and return the authenticated user. Raises 401 if invalid.
+
+    The user may come from a short-lived cache shared across requests, so
+    treat it as read-only (it is not attached to this request's session).
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,10 +46,16 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    user = _user_cache.get(credentials.credentials)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    db.expunge(user)
+    _user_cache[credentials.credentials] = user
     return user
 
 
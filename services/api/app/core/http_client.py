@@ -0,0 +1,38 @@
+"""Process-wide httpx client for outbound API calls."""
+from typing import Optional
+
+import httpx
+
+# Per-call timeouts still override this; it's only the fallback
+DEFAULT_TIMEOUT = 15.0
+
+# Sent on every request; MusicBrainz and Cover Art Archive ask for a
+# descriptive User-Agent with contact details
+DEFAULT_HEADERS = {"User-Agent": "Raido/1.0 (raido@bhsuarez.com)"}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use.
+
+    Reusing one client keeps connections to MusicBrainz, Cover Art Archive
+    etc. alive between requests instead of paying a TCP+TLS handshake per
+    call. Usable from request handlers and background tasks alike.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client; called from the app lifespan on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,35 @@
+"""Process-wide Redis client for caches shared across API workers."""
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Return the shared Redis client, or None when REDIS_URL isn't configured.
+
+    Callers treat Redis as a best-effort cache tier: a None client or a
+    failing command should fall through to the real lookup.
+    """
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        _client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared client; called from the app lifespan on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -6,10 +6,15 @@ from typing import Optional, Tuple
 from uuid import uuid4
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from jose import jwt
 
 from app.core.config import settings
 
+_ARGON2_PREFIX = "$argon2"
+_argon2_hasher = PasswordHasher()
+
 
 def create_access_token(subject: str | int, expires_delta: Optional[timedelta] = None) -> str:
     """Create a signed JWT access token."""
@@ -42,12 +47,24 @@ def create_refresh_token(
 
 
 def verify_password(plain_password: str, hashed_password: str | None) -> bool:
-    """Compare a plain password with a stored hash."""
+    """Compare a plain password with a stored argon2id or legacy bcrypt hash."""
     if not hashed_password:
         return False
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        try:
+            return _argon2_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    """Hash a password using argon2id."""
+    return _argon2_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy bcrypt hashes or argon2 hashes with outdated parameters."""
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    return _argon2_hasher.check_needs_rehash(hashed_password)
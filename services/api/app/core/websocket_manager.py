@@ -1,10 +1,15 @@
+import asyncio
 from typing import List, Dict, Any
 from fastapi import WebSocket
+import orjson
 import structlog
-import json
 
 logger = structlog.get_logger()
 
+# A client that can't take a frame within this long is treated as gone
+BROADCAST_SEND_TIMEOUT = 2.0
+BROADCAST_BATCH_SIZE = 50
+
 class WebSocketManager:
     """Manages WebSocket connections for live updates"""
     
@@ -36,15 +41,28 @@ class WebSocketManager:
         if not self.active_connections:
             return
         
-        message_str = json.dumps(message)
+        # Serialize once; every client gets the same frame
+        message_str = orjson.dumps(message).decode()
         disconnected_clients = []
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_str)
-            except Exception as e:
-                logger.error("Failed to broadcast message", error=str(e))
-                disconnected_clients.append(connection)
+        # Send concurrently so one slow client can't hold up the rest, in
+        # batches that yield to the event loop between them
+        connections = list(self.active_connections)
+        for start in range(0, len(connections), BROADCAST_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            batch = connections[start:start + BROADCAST_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(
+                    asyncio.wait_for(connection.send_text(message_str), BROADCAST_SEND_TIMEOUT)
+                    for connection in batch
+                ),
+                return_exceptions=True,
+            )
+            for connection, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to broadcast message", error=str(result) or type(result).__name__)
+                    disconnected_clients.append(connection)
         
         # Remove disconnected clients
         for client in disconnected_clients:
@@ -72,4 +90,11 @@ class WebSocketManager:
         await self.broadcast({
             "type": "track_change",
             "data": track_data
-        })
\ No newline at end of file
+        })
+
+    async def broadcast_track_artwork(self, artwork_data: Dict[str, Any]):
+        """Broadcast artwork found after a track change was announced"""
+        await self.broadcast({
+            "type": "track_artwork",
+            "data": artwork_data
+        })
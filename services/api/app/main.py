@@ -4,13 +4,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+import orjson
 import structlog
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.http_client import close_http_client
 from app.core.logging_config import configure_logging
+from app.core.redis_client import close_redis
+from app.services.liquidsoap_telnet import close_telnet_pools
+from app.services.metadata_extractor import shutdown_metadata_pool
 from app.api.v1 import api_router
 from app.core.websocket_manager import WebSocketManager
 
@@ -104,6 +109,10 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("🏴‍☠️ Raido API shutting down...")
+    await close_http_client()
+    await close_telnet_pools()
+    await close_redis()
+    shutdown_metadata_pool()
 
 # Create FastAPI app
 app = FastAPI(
@@ -112,7 +121,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.APP_ENV == "development" else None,
     redoc_url="/redoc" if settings.APP_ENV == "development" else None,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware
@@ -157,12 +167,12 @@ async def internal_ws_broadcast(request: Request):
     Not exposed externally (behind Caddy proxy).
     """
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
         await websocket_manager.broadcast(body)
         return {"status": "ok", "clients": len(websocket_manager.active_connections)}
     except Exception as e:
         logger.error("Internal WS broadcast failed", error=str(e))
-        return JSONResponse(status_code=500, content={"detail": str(e)})
+        return ORJSONResponse(status_code=500, content={"detail": str(e)})
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -181,7 +191,7 @@ async def websocket_endpoint(websocket: WebSocket):
 async def global_exception_handler(request, exc):
     """Global exception handler"""
     logger.error("Unhandled exception", exc_info=exc, path=str(request.url))
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
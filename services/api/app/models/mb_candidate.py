@@ -1,6 +1,6 @@
 """MusicBrainz candidate matches awaiting user review."""
 import enum
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -51,5 +51,31 @@ class MBCandidate(Base):
     # Relationships
     track = relationship("Track", backref="mb_candidates")
 
+    __table_args__ = (
+        # Index-only scans for the review queue and per-status stats counts
+        Index(
+            "ix_mb_candidates_status_track_id",
+            "status",
+            "track_id",
+            postgresql_include=["score"],
+        ),
+        # Per-track lookups that also filter on status (skip/approve/reject)
+        Index("ix_mb_candidates_track_id_status", "track_id", "status"),
+        # Serves a track's candidates already in display order (best score first)
+        # (Postgres only: SQLite can't create NULLS LAST indexes)
+        Index(
+            "ix_mb_candidates_track_id_score", "track_id", score.desc().nullslast()
+        ).ddl_if(dialect="postgresql"),
+        # One candidate per track/release/recording; the conflict target for
+        # the manual lookup upsert
+        Index(
+            "ux_mb_candidates_track_release_recording",
+            "track_id",
+            "mb_release_id",
+            func.coalesce(mb_recording_id, ""),
+            unique=True,
+        ),
+    )
+
     def __repr__(self):
         return f"<MBCandidate(id={self.id}, track_id={self.track_id}, status={self.status}, score={self.score})>"
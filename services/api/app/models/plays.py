@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -39,9 +39,31 @@ class Play(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    track = relationship("Track", back_populates="plays")
+    # Hot paths (track_change, history) work from track_id or load the track
+    # explicitly; an accidental lazy load here should fail loudly, not add a
+    # hidden SELECT per play
+    track = relationship("Track", back_populates="plays", lazy="raise_on_sql")
     station = relationship("Station", back_populates="plays")
     commentaries = relationship("Commentary", back_populates="play")
+
+    __table_args__ = (
+        # Only the few still-playing rows; serves the "current play" lookups
+        # without walking the whole started_at index
+        Index(
+            "ix_plays_open_started_at",
+            started_at.desc(),
+            postgresql_where=ended_at.is_(None),
+        ),
+        # At most one open play per station; track_change ends it with a
+        # single UPDATE on this index and uses it as the insert's conflict target
+        Index(
+            "uq_plays_open_per_station",
+            func.lower(func.coalesce(station_identifier, "main")),
+            unique=True,
+            postgresql_where=ended_at.is_(None),
+            sqlite_where=ended_at.is_(None),
+        ),
+    )
     
     def __repr__(self):
         return f"<Play(id={self.id}, track_id={self.track_id}, station='{self.station_identifier}', started_at={self.started_at})>"
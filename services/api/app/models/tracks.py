@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Float, Boolean
+import os
+
+from sqlalchemy import Column, Integer, BigInteger, String, JSON, DateTime, Float, Boolean, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from app.core.database import Base
 from .stations import station_tracks
@@ -18,7 +20,13 @@ class Track(Base):
     duration_ms = Column(Integer, nullable=True)
     duration_sec = Column(Float, nullable=True)
     file_path = Column(String(1000), nullable=False, unique=True, index=True)
-    file_size = Column(Integer, nullable=True)
+    # Final component of file_path, kept in sync by _sync_basename so
+    # Liquidsoap filename lookups are an indexed equality, not a LIKE '%...'
+    basename = Column(String(1000), nullable=True, index=True)
+    # Size and mtime of the file when it was last parsed; library rescans
+    # skip files whose stat still matches
+    file_size = Column(BigInteger, nullable=True)
+    file_mtime_ns = Column(BigInteger, nullable=True)
     bitrate = Column(Integer, nullable=True)
     sample_rate = Column(Integer, nullable=True)
 
@@ -73,6 +81,27 @@ class Track(Base):
         "Station", secondary=station_tracks, back_populates="tracks"
     )
     voicing_cache = relationship("TrackVoicingCache", back_populates="track", uselist=False)
+    # Read-only, best-score-first view of MBCandidate rows (writes go through
+    # the MBCandidate.track / Track.mb_candidates backref)
+    candidates = relationship(
+        "MBCandidate",
+        order_by="MBCandidate.score.desc().nullslast()",
+        viewonly=True,
+    )
+
+    __table_args__ = (
+        # Backs the enrichment "unqueued" count, which only scans tracks without an MBID
+        Index(
+            "ix_tracks_id_missing_recording_mbid",
+            "id",
+            postgresql_where=recording_mbid.is_(None),
+        ),
+    )
+
+    @validates("file_path")
+    def _sync_basename(self, key, value):
+        self.basename = os.path.basename(value) if value else None
+        return value
 
     def __repr__(self):
         return f"<Track(id={self.id}, title='{self.title}', artist='{self.artist}')>"
@@ -4,11 +4,14 @@ Liquidsoap telnet client for getting real-time metadata and status
 
 import socket
 import structlog
+from cachetools import TTLCache
 from typing import Dict, Any, Optional, List, Tuple
 import re
 import time
 import threading
 
+from app.services.liquidsoap_telnet import get_telnet_pool
+
 logger = structlog.get_logger()
 
 
@@ -196,13 +199,14 @@ class LiquidsoapClient:
             logger.error("Failed to skip track", error=str(e))
             return False
     
-    def _parse_metadata_response(self, response: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_metadata_response(response: str) -> Dict[str, Any]:
         """Parse a metadata response from Liquidsoap"""
         metadata = {}
         
         # Support comma-separated single-line and multi-line (request.metadata ... END)
         if '\n' not in response and ',' in response:
-            parts = self._split_metadata_string(response)
+            parts = LiquidsoapClient._split_metadata_string(response)
             for part in parts:
                 if '=' in part:
                     key, value = part.split('=', 1)
@@ -225,7 +229,8 @@ class LiquidsoapClient:
         
         return metadata
     
-    def _split_metadata_string(self, s: str) -> List[str]:
+    @staticmethod
+    def _split_metadata_string(s: str) -> List[str]:
         """Split metadata string on commas, respecting quoted values"""
         parts = []
         current = ""
@@ -314,6 +319,10 @@ class LiquidsoapClient:
             meta = self.get_request_metadata(rid)
             statuses[rid] = (meta.get('status') or '').lower()
 
+        return self._pick_current_and_next(sorted_rids, statuses)
+
+    @staticmethod
+    def _pick_current_and_next(sorted_rids: List[int], statuses: Dict[int, str]) -> Tuple[Optional[int], Optional[int]]:
         # Determine current
         playing_rids = [rid for rid in sorted_rids if statuses.get(rid) == 'playing']
         current: Optional[int] = playing_rids[0] if playing_rids else sorted_rids[0]
@@ -335,3 +344,57 @@ class LiquidsoapClient:
         if next_rid is None:
             return None
         return self.get_request_metadata(next_rid)
+
+
+# Request-queue replies, shared by every AsyncLiquidsoapClient in the process
+# (handlers build a client per request) to absorb bursts of polling
+_async_command_cache: TTLCache = TTLCache(maxsize=512, ttl=0.5)
+
+
+class AsyncLiquidsoapClient:
+    """Request-queue helpers of LiquidsoapClient for async handlers.
+
+    Commands go over the shared persistent connection for the host (see
+    LiquidsoapTelnetPool) instead of a blocking socket per command.
+    """
+
+    def __init__(self, host: str = "liquidsoap", port: int = 1234):
+        self.host = host
+        self.port = port
+
+    async def _send_command(self, command: str) -> str:
+        key = (self.host, self.port, command)
+        cached = _async_command_cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            response = await get_telnet_pool(self.host, self.port).command(command)
+        except Exception as e:
+            logger.error("Failed to send Liquidsoap command", command=command, error=str(e))
+            return ""
+        _async_command_cache[key] = response
+        return response
+
+    async def list_request_ids(self) -> List[int]:
+        """Return list of request IDs from `request.all`."""
+        resp = await self._send_command("request.all")
+        return [int(token) for token in resp.split() if token.isdigit()]
+
+    async def get_request_metadata(self, rid: int) -> Dict[str, Any]:
+        """Return metadata dict for a request id via `request.metadata <rid>`."""
+        resp = await self._send_command(f"request.metadata {rid}")
+        return LiquidsoapClient._parse_metadata_response(resp)
+
+    async def get_current_and_next_ready_rid(self, rids: Optional[List[int]] = None) -> Tuple[Optional[int], Optional[int]]:
+        """Identify current and next RIDs, as LiquidsoapClient does."""
+        if rids is None:
+            rids = await self.list_request_ids()
+        if not rids:
+            return None, None
+
+        sorted_rids = sorted(rids)
+        statuses: Dict[int, str] = {}
+        for rid in sorted_rids:
+            meta = await self.get_request_metadata(rid)
+            statuses[rid] = (meta.get('status') or '').lower()
+        return LiquidsoapClient._pick_current_and_next(sorted_rids, statuses)
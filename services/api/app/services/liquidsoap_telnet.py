@@ -0,0 +1,101 @@
+"""
+Persistent asyncio connections to Liquidsoap's telnet interface
+"""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class LiquidsoapTelnetPool:
+    """One long-lived telnet connection to a Liquidsoap instance.
+
+    Commands are serialized over the connection under a lock, so each one
+    costs a write and a read instead of a TCP connect/teardown. The
+    connection is reopened transparently when Liquidsoap drops it (its
+    telnet server closes idle clients).
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._conn: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._lock = asyncio.Lock()
+
+    async def command(self, command: str) -> str:
+        """Run a telnet command and return its reply without the END marker"""
+        async with self._lock:
+            reused = self._conn is not None
+            try:
+                return await self._send(command)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self._close()
+                if not reused:
+                    raise
+                # Stale pooled connection; retry once on a fresh one
+                logger.debug("Reopening Liquidsoap telnet connection", host=self.host, error=str(e))
+                try:
+                    return await self._send(command)
+                except BaseException:
+                    await self._close()
+                    raise
+            except BaseException:
+                # Timeouts/cancellation leave the reply stream in an unknown state
+                await self._close()
+                raise
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close()
+
+    async def _send(self, command: str) -> str:
+        if self._conn is None:
+            self._conn = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        reader, writer = self._conn
+        writer.write(f"{command}\n".encode())
+        await writer.drain()
+
+        lines = []
+        while True:
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionResetError("Liquidsoap closed the telnet connection")
+            line = line.decode(errors="ignore").rstrip("\r\n")
+            if line == "END":
+                return "\n".join(lines).strip()
+            lines.append(line)
+
+    async def _close(self) -> None:
+        if self._conn is None:
+            return
+        _, writer = self._conn
+        self._conn = None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+_pools: Dict[Tuple[str, int], LiquidsoapTelnetPool] = {}
+
+
+def get_telnet_pool(host: str, port: int) -> LiquidsoapTelnetPool:
+    """Return the shared connection for a Liquidsoap host/port, creating it on first use"""
+    pool = _pools.get((host, port))
+    if pool is None:
+        pool = _pools[(host, port)] = LiquidsoapTelnetPool(host, port)
+    return pool
+
+
+async def close_telnet_pools() -> None:
+    """Close all pooled connections; called from the app lifespan on shutdown"""
+    for pool in list(_pools.values()):
+        await pool.close()
+    _pools.clear()
@@ -3,10 +3,14 @@ Comprehensive audio metadata extraction service using mutagen.
 Extracts full metadata from audio files including ID3 tags, duration, bitrate, etc.
 """
 
+import asyncio
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Awaitable, Callable, Collection, Dict, Any, Optional, List, Set, Tuple
 import structlog
 from mutagen import File as MutagenFile
 from mutagen.id3 import ID3NoHeaderError
@@ -17,6 +21,35 @@ from mutagen.oggvorbis import OggVorbis
 
 logger = structlog.get_logger()
 
+# (path, size, mtime_ns) of an audio file found while walking a directory
+FileStat = Tuple[str, int, int]
+SkipFilesHook = Callable[[List[FileStat]], Awaitable[Collection[str]]]
+
+# Tag parsing is CPU-bound Python; directory scans (and batch artwork
+# extraction) fan it out across cores
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared parsing pool, starting it on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # Forking the running server would copy its event loop, DB pool and
+        # held locks into the workers; forkserver children start clean
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _process_pool
+
+
+def shutdown_metadata_pool() -> None:
+    """Stop the parsing pool; called from the app lifespan on shutdown"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
 
 class MetadataExtractor:
     """Extracts comprehensive metadata from audio files"""
@@ -34,6 +67,12 @@ class MetadataExtractor:
         Returns:
             Dictionary containing extracted metadata
         """
+        # mutagen and the filesystem calls block; keep them off the event loop
+        return await asyncio.to_thread(cls._read_file_metadata, file_path)
+    
+    @classmethod
+    def _read_file_metadata(cls, file_path: str) -> Dict[str, Any]:
+        """Synchronous body of extract_file_metadata"""
         try:
             path = Path(file_path)
             
@@ -58,6 +97,7 @@ class MetadataExtractor:
                 'filename': path.name,
                 'file_size_bytes': file_stats.st_size,
                 'file_modified_at': file_stats.st_mtime,
+                'file_mtime_ns': file_stats.st_mtime_ns,
                 'format': path.suffix.lower().lstrip('.'),
                 'codec': cls._get_codec_info(audio_file),
             }
@@ -108,35 +148,93 @@ class MetadataExtractor:
         Returns:
             List of metadata dictionaries
         """
-        results = []
+        return [metadata async for metadata in cls.iter_directory(directory_path, recursive)]
+    
+    @classmethod
+    async def iter_directory(cls, directory_path: str, recursive: bool = True,
+                             max_pending: int = 64,
+                             skip_files: Optional[SkipFilesHook] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Walk a directory and yield metadata for its audio files as parsed
+        
+        Files are parsed in worker processes, at most max_pending at a time,
+        and yielded in completion order, so callers can store results while
+        the walk continues instead of holding the whole library in memory.
+        
+        skip_files, if given, is called with each directory's
+        (path, size, mtime_ns) stats and returns the paths not to parse,
+        e.g. files unchanged since the last scan.
+        """
         path = Path(directory_path)
         
         if not path.exists() or not path.is_dir():
             logger.warning("Directory not found or not a directory", path=directory_path)
-            return results
+            return
+        
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        pending: Set[asyncio.Future] = set()
+        directories = [directory_path]
+        files_found = 0
+        files_skipped = 0
+        
+        async def drain(limit: int) -> List[Dict[str, Any]]:
+            nonlocal pending
+            finished: List[Dict[str, Any]] = []
+            while len(pending) > limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                finished.extend(metadata for metadata in (f.result() for f in done) if metadata)
+            return finished
         
         try:
-            # Get all audio files
-            pattern = "**/*" if recursive else "*"
-            audio_files = []
-            
-            for file_path in path.glob(pattern):
-                if file_path.is_file() and file_path.suffix.lower() in cls.SUPPORTED_FORMATS:
-                    audio_files.append(str(file_path))
+            while directories:
+                audio_files, subdirectories = await asyncio.to_thread(
+                    cls._list_directory, directories.pop()
+                )
+                if recursive:
+                    directories.extend(subdirectories)
+                files_found += len(audio_files)
+                skipped = set(await skip_files(audio_files)) if skip_files and audio_files else set()
+                files_skipped += len(skipped)
+                for file_path, _, _ in audio_files:
+                    if file_path in skipped:
+                        continue
+                    pending.add(loop.run_in_executor(pool, cls._read_file_metadata, file_path))
+                    for metadata in await drain(max_pending - 1):
+                        yield metadata
+            for metadata in await drain(0):
+                yield metadata
             
-            logger.info("Found audio files for scanning", count=len(audio_files), directory=directory_path)
-            
-            # Extract metadata from each file
-            for file_path in audio_files:
-                metadata = await cls.extract_file_metadata(file_path)
-                if metadata:
-                    results.append(metadata)
-            
-            return results
+            logger.info("Scanned audio files", count=files_found, skipped=files_skipped,
+                        directory=directory_path)
             
+        except BrokenProcessPool as e:
+            # A worker died (e.g. crashed in a native decoder); start a fresh
+            # pool on the next scan
+            logger.error("Metadata worker pool broke during scan", directory=directory_path, error=str(e))
+            shutdown_metadata_pool()
         except Exception as e:
             logger.error("Failed to scan directory", directory=directory_path, error=str(e))
-            return results
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    @classmethod
+    def _list_directory(cls, directory_path: str) -> Tuple[List[FileStat], List[str]]:
+        """(path, size, mtime_ns) of the supported audio files in one
+        directory, and its subdirectories (blocking)"""
+        audio_files, subdirectories = [], []
+        try:
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirectories.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in cls.SUPPORTED_FORMATS:
+                        st = entry.stat()
+                        audio_files.append((entry.path, st.st_size, st.st_mtime_ns))
+        except OSError as e:
+            logger.warning("Could not read directory", path=directory_path, error=str(e))
+        return audio_files, subdirectories
     
     @classmethod
     def _extract_tags(cls, tags, file_format: str) -> Dict[str, Any]:
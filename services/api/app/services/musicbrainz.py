@@ -0,0 +1,52 @@
+"""
+MusicBrainz web service (/ws/2 JSON) access over the shared HTTP client
+"""
+
+import asyncio
+import re
+from typing import Any, Dict
+
+from app.core.http_client import get_http_client
+
+MB_API_BASE = "https://musicbrainz.org/ws/2"
+# MusicBrainz allows one request per second per client
+MB_MIN_REQUEST_INTERVAL = 1.0
+_mb_throttle_lock = asyncio.Lock()
+_mb_last_request_at = 0.0
+
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+async def mb_throttle() -> None:
+    """Space MusicBrainz requests at least MB_MIN_REQUEST_INTERVAL apart"""
+    global _mb_last_request_at
+    async with _mb_throttle_lock:
+        loop = asyncio.get_running_loop()
+        delay = _mb_last_request_at + MB_MIN_REQUEST_INTERVAL - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _mb_last_request_at = loop.time()
+
+
+async def mb_get(path: str, params: Dict[str, Any], timeout: float = 10.0) -> dict:
+    """GET a /ws/2 resource as JSON, throttled; raises for HTTP errors"""
+    await mb_throttle()
+    resp = await get_http_client().get(
+        f"{MB_API_BASE}/{path}", params={**params, "fmt": "json"}, timeout=timeout
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _lucene_escape(value: str) -> str:
+    return _LUCENE_SPECIAL_RE.sub(r"\\\1", value)
+
+
+def mb_search_query(**fields: str) -> str:
+    """Build a Lucene search query the way musicbrainzngs' search_* did:
+    escaped, lowercased ``field:(value)`` terms joined with spaces"""
+    return " ".join(
+        f"{field}:({_lucene_escape(value).lower()})"
+        for field, value in fields.items()
+        if value
+    )
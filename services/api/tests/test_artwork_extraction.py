@@ -0,0 +1,124 @@
+import asyncio
+import io
+
+from mutagen.flac import Picture
+from mutagen.id3 import ID3, APIC
+from starlette.requests import Request
+
+from app.api.v1.endpoints import artwork
+
+
+JPEG_BYTES = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+def _flac_block(block_type: int, body: bytes, last: bool = False) -> bytes:
+    header = (0x80 if last else 0) | block_type
+    return bytes([header]) + len(body).to_bytes(3, "big") + body
+
+
+def _write_flac(path, *blocks: bytes) -> None:
+    path.write_bytes(b"fLaC" + b"".join(blocks))
+
+
+def test_read_flac_picture_skips_other_blocks(tmp_path):
+    picture = Picture()
+    picture.type = 3
+    picture.mime = "image/jpeg"
+    picture.desc = "Front cover"
+    picture.data = JPEG_BYTES
+
+    flac_path = tmp_path / "song.flac"
+    _write_flac(
+        flac_path,
+        _flac_block(0, b"\x00" * 34),  # STREAMINFO
+        _flac_block(1, b"\x00" * 128),  # PADDING
+        _flac_block(6, picture.write(), last=True),
+    )
+
+    data, mime_type = artwork._extract_artwork_from_file(str(flac_path))
+
+    assert data == JPEG_BYTES
+    assert mime_type == "image/jpeg"
+
+
+def test_read_flac_picture_without_picture_block(tmp_path):
+    flac_path = tmp_path / "song.flac"
+    _write_flac(flac_path, _flac_block(0, b"\x00" * 34, last=True))
+
+    assert artwork._read_flac_picture(str(flac_path)) == (None, None)
+
+
+def test_read_flac_picture_defers_non_native_flac(tmp_path):
+    flac_path = tmp_path / "song.flac"
+    flac_path.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x00")
+
+    assert artwork._read_flac_picture(str(flac_path)) is None
+
+
+def test_extract_mp3_artwork_from_id3(tmp_path):
+    mp3_path = tmp_path / "song.mp3"
+    mp3_path.write_bytes(b"")
+
+    tags = ID3()
+    tags.add(APIC(encoding=3, mime="image/png", type=3, desc="cover", data=b"\x89PNG\r\n\x1a\nxyz"))
+    tags.save(str(mp3_path))
+
+    data, mime_type = artwork._extract_artwork_from_file(str(mp3_path))
+
+    assert data == b"\x89PNG\r\n\x1a\nxyz"
+    assert mime_type == "image/png"
+
+
+def test_extract_mp3_without_tags(tmp_path):
+    mp3_path = tmp_path / "song.mp3"
+    mp3_path.write_bytes(b"\xff\xfb\x90\x00" + b"\x00" * 256)
+
+    assert artwork._extract_artwork_from_file(str(mp3_path)) == (None, None)
+
+
+def test_write_cached_artwork_generates_thumbnails(tmp_path, monkeypatch):
+    from PIL import Image
+
+    monkeypatch.setattr(artwork, "ARTWORK_DIR", tmp_path)
+    buffer = io.BytesIO()
+    Image.new("RGB", (1000, 800), "red").save(buffer, "PNG")
+
+    url = artwork._write_cached_artwork(7, buffer.getvalue(), "image/png")
+
+    assert url == "/static/artwork/track_7.png"
+    assert (tmp_path / "track_7.png").read_bytes() == buffer.getvalue()
+    with Image.open(artwork._find_cached_artwork(7, "s")) as small:
+        assert small.format == "JPEG"
+        assert max(small.size) == 128
+    with Image.open(artwork._find_cached_artwork(7, "m")) as medium:
+        assert max(medium.size) == 512
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_write_cached_artwork_skips_thumbnails_for_undecodable_art(tmp_path, monkeypatch):
+    monkeypatch.setattr(artwork, "ARTWORK_DIR", tmp_path)
+
+    artwork._write_cached_artwork(8, JPEG_BYTES, "image/jpeg")
+
+    assert artwork._find_cached_artwork(8) == tmp_path / "track_8.jpg"
+    assert artwork._find_cached_artwork(8, "s") is None
+
+
+def test_cached_artwork_redirect_supports_conditional_get(tmp_path, monkeypatch):
+    monkeypatch.setattr(artwork, "ARTWORK_DIR", tmp_path)
+    artwork._write_cached_artwork(9, JPEG_BYTES, "image/jpeg")
+
+    def request(headers=()):
+        return Request({"type": "http", "headers": list(headers)})
+
+    redirect = asyncio.run(artwork.get_track_artwork(9, request(), "orig", None))
+    assert redirect.status_code == 302
+    assert redirect.headers["location"] == "/static/artwork/track_9.jpg"
+    assert redirect.headers["cache-control"] == artwork.ARTWORK_CACHE_CONTROL
+    etag = redirect.headers["etag"]
+
+    not_modified = asyncio.run(artwork.get_track_artwork(
+        9, request([(b"if-none-match", etag.encode())]), "orig", None
+    ))
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
@@ -0,0 +1,33 @@
+import asyncio
+import os
+
+from app.services.metadata_extractor import MetadataExtractor, shutdown_metadata_pool
+
+
+def _scanned_paths(directory):
+    seen = []
+
+    async def skip_all(files):
+        # Record what the walk found without parsing anything
+        seen.extend(path for path, _, _ in files)
+        return [path for path, _, _ in files]
+
+    async def _run():
+        async for _ in MetadataExtractor.iter_directory(str(directory), skip_files=skip_all):
+            pass
+
+    try:
+        asyncio.run(_run())
+    finally:
+        shutdown_metadata_pool()
+    return seen
+
+
+def test_directory_walk_does_not_follow_symlinked_directories(tmp_path):
+    album = tmp_path / "album"
+    album.mkdir()
+    (album / "x.mp3").write_bytes(b"\x00")
+    os.symlink("..", album / "loop")
+    os.symlink(album, tmp_path / "album-link")
+
+    assert _scanned_paths(tmp_path) == [str(album / "x.mp3")]
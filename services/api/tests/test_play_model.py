@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.database import Base
+from app.models import Play, Station, Track
+
+
+def test_play_track_is_never_lazy_loaded():
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async_session = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            async with async_session() as session:
+                track = Track(title="Song", artist="Artist", file_path="/tmp/song.mp3")
+                station = Station(identifier="main", name="Main")
+                session.add_all([track, station])
+                await session.flush()
+                session.add(Play(
+                    track_id=track.id,
+                    station_id=station.id,
+                    started_at=datetime.now(timezone.utc),
+                ))
+                await session.commit()
+
+            async with async_session() as session:
+                play = (await session.execute(select(Play))).scalar_one()
+                with pytest.raises(InvalidRequestError):
+                    play.track
+
+            async with async_session() as session:
+                play = (await session.execute(
+                    select(Play).options(selectinload(Play.track))
+                )).scalar_one()
+                assert play.track.title == "Song"
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
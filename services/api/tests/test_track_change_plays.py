@@ -0,0 +1,84 @@
+import asyncio
+
+from fastapi import BackgroundTasks
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints import liquidsoap
+from app.core.database import Base
+from app.models import Play, Track
+
+
+def _run_with_db(scenario):
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async_session = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        liquidsoap._station_ids.clear()
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            await scenario(engine, async_session)
+        finally:
+            liquidsoap._station_ids.clear()
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+async def _track_change(async_session, filename):
+    async with async_session() as db:
+        return await liquidsoap.track_change_notification(
+            liquidsoap.TrackChangeRequest(
+                title=filename, artist="Artist", filename=filename, station="main"
+            ),
+            BackgroundTasks(),
+            db,
+        )
+
+
+def test_back_to_back_track_changes_leave_one_open_play():
+    async def scenario(engine, async_session):
+        first = await _track_change(async_session, "/music/one.mp3")
+        second = await _track_change(async_session, "/music/two.mp3")
+
+        async with async_session() as db:
+            plays = (await db.execute(select(Play).order_by(Play.id))).scalars().all()
+        assert [p.id for p in plays] == [first["play_id"], second["play_id"]]
+        assert plays[0].ended_at is not None
+        assert plays[1].ended_at is None
+
+    _run_with_db(scenario)
+
+
+def test_track_change_closes_play_opened_by_overlapping_callback():
+    async def scenario(engine, async_session):
+        await _track_change(async_session, "/music/one.mp3")
+        competing = {"inserted": False}
+
+        # Another callback for the station opens its play between our UPDATE
+        # and INSERT; ours must close it and retry instead of failing
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def open_competing_play(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO plays") and not competing["inserted"]:
+                competing["inserted"] = True
+                cursor.execute(
+                    "INSERT INTO plays (track_id, station_id, station_identifier, started_at, "
+                    "source_type, was_skipped, triggered_commentary, commentary_before, commentary_after) "
+                    "SELECT track_id, station_id, station_identifier, CURRENT_TIMESTAMP, source_type, 0, 0, 0, 0 "
+                    "FROM plays LIMIT 1"
+                )
+
+        result = await _track_change(async_session, "/music/two.mp3")
+        assert competing["inserted"]
+
+        async with async_session() as db:
+            plays = (await db.execute(select(Play).order_by(Play.id))).scalars().all()
+            track = await db.get(Track, result["track_id"])
+        assert len(plays) == 3
+        assert [p.id for p in plays if p.ended_at is None] == [result["play_id"]]
+        assert track.play_count == 1
+
+    _run_with_db(scenario)
@@ -82,20 +82,22 @@ class _MBCandidate(sa.orm.MappedAsDataclass, _Base):
     )
 
 
-_NON_GENRE_TAGS = {
+# Lowercase; compare against tag.lower()
+_NON_GENRE_TAGS: frozenset[str] = frozenset({
     "animal on cover", "dog on cover", "cat on cover", "energetic", "playful",
     "melancholic", "uplifting", "eclectic", "melodic", "sarcastic", "satirical",
     "quirky", "urban", "aggressive", "dark", "romantic", "happy", "sad",
     "instrumental", "live", "compilation", "reissue", "remixed",
-}
+})
 
 
 def _top_genre(tags: list) -> Optional[str]:
-    filtered = [t for t in tags if t.get("name", "").lower() not in _NON_GENRE_TAGS]
-    if not filtered:
-        return None
-    top = max(filtered, key=lambda t: int(t.get("count", 0)))
-    return top["name"].title()
+    top = max(
+        (t for t in tags if t.get("name", "").lower() not in _NON_GENRE_TAGS),
+        key=lambda t: int(t.get("count", 0)),
+        default=None,
+    )
+    return top["name"].title() if top else None
 
 
 def _mb_search_recordings(artist: str, title: str) -> list:
@@ -41,6 +41,12 @@ export function useWebSocket() {
               queryClient.invalidateQueries({ queryKey: ['history'] })
               break
               
+            case 'track_artwork':
+              // Artwork resolved after the track_change went out
+              queryClient.invalidateQueries({ queryKey: ['nowPlaying'] })
+              queryClient.invalidateQueries({ queryKey: ['history'] })
+              break
+
             case 'commentary':
               toast('🗣️ New DJ commentary!', {
                 icon: '🎙️',
@@ -155,7 +155,6 @@ export default function MBEnrich() {
   const [stats, setStats] = useState<Stats | null>(null)
   const [tracks, setTracks] = useState<TrackWithCandidates[]>([])
   const [selectedIdx, setSelectedIdx] = useState(0)
-  const [page, setPage] = useState(1)
   const [hasMore, setHasMore] = useState(true)
   const [loading, setLoading] = useState(false)
   const [actionLoading, setActionLoading] = useState(false)
@@ -184,10 +183,13 @@ export default function MBEnrich() {
     } catch {}
   }, [authFetch])
 
-  const loadQueue = useCallback(async (pg: number, append = false) => {
+  // Keyset pagination: pass the last loaded track id to append the next page
+  const loadQueue = useCallback(async (afterId?: number) => {
+    const append = afterId !== undefined
     setLoading(true)
     try {
-      const res = await authFetch(`${API}/enrichment/queue?page=${pg}&per_page=50&status=pending`)
+      const cursor = append ? `&after_id=${afterId}` : ''
+      const res = await authFetch(`${API}/enrichment/queue?per_page=50&status=pending${cursor}`)
       if (res.status === 401) { clearAuth(); navigate('/login'); return }
       const data: TrackWithCandidates[] = await res.json()
       setTracks(prev => append ? [...prev, ...data] : data)
@@ -198,7 +200,7 @@ export default function MBEnrich() {
     }
   }, [authFetch])
 
-  useEffect(() => { loadStats(); loadQueue(1) }, [])
+  useEffect(() => { loadStats(); loadQueue() }, [])
 
   // Remove a track from the local list after action
   const removeTrack = (trackId: number) => {
@@ -303,10 +305,8 @@ export default function MBEnrich() {
 
   // Infinite scroll: load more when near end of list
   useEffect(() => {
-    if (selectedIdx >= tracks.length - 5 && hasMore && !loading) {
-      const nextPage = page + 1
-      setPage(nextPage)
-      loadQueue(nextPage, true)
+    if (selectedIdx >= tracks.length - 5 && hasMore && !loading && tracks.length > 0) {
+      loadQueue(tracks[tracks.length - 1].id)
     }
   }, [selectedIdx])
 
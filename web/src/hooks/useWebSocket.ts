@@ -42,6 +42,12 @@ export function useWebSocket() {
               queryClient.invalidateQueries({ queryKey: ['history'] })
               break
 
+            case 'track_artwork':
+              // Artwork resolved after the track_change went out
+              queryClient.invalidateQueries({ queryKey: ['nowPlaying'] })
+              queryClient.invalidateQueries({ queryKey: ['history'] })
+              break
+
             case 'commentary_token':
               if (message.data?.token) {
                 appendCommentaryToken(message.data.token)